@@ -3,15 +3,24 @@ Avengers Guard Web Interface - Flask Server
 Wraps existing system without modifying it
 """
 
+# eventlet must patch the stdlib before anything else imports socket/threading
+import eventlet
+eventlet.monkey_patch()
+from eventlet import tpool
+import eventlet.wsgi
+
 from flask import Flask, render_template, Response, jsonify, request
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room
 import cv2
 import numpy as np
-import base64
 import json
 from pathlib import Path
 import sys
 import os
+import threading
+import time
+import queue
+import gc
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -19,22 +28,74 @@ sys.path.insert(0, str(Path(__file__).parent))
 # Import your existing system (don't modify anything)
 from src.core.state_machine import EscalationStateMachine
 from src.agents.agent_manager import AgentManager
-from src.agents.base_agent import ThreatLevel
-from src.audio.sound_effects import SoundEffectsManager
-from src.notifications.telegram_bot import TelegramNotifier
+from src.agents.base_agent import ThreatLevel, InteractionContext
 
-# Import from milestone notebooks if available
+# libjpeg-turbo bindings for SIMD JPEG encode/decode (falls back to OpenCV)
 try:
-    from src.integration.milestone2_classes import FaceEnrollmentSystem, FaceRecognitionEngine
-    FACE_RECOGNITION_AVAILABLE = True
-except:
-    FACE_RECOGNITION_AVAILABLE = False
-    print("⚠️  Face recognition not available")
+    from turbojpeg import TurboJPEG
+    _turbo_jpeg = TurboJPEG()
+except Exception:
+    _turbo_jpeg = None
+
+# Face recognition classes from the milestone notebooks, imported on first use
+# so dlib/face_recognition stay off the interpreter startup path
+_face_classes = None
+
+def _get_face_classes():
+    """Return (FaceEnrollmentSystem, FaceRecognitionEngine), or None if unavailable"""
+    global _face_classes
+    if _face_classes is None:
+        try:
+            from src.integration.milestone2_classes import FaceEnrollmentSystem, FaceRecognitionEngine
+            _face_classes = (FaceEnrollmentSystem, FaceRecognitionEngine)
+        except Exception:
+            _face_classes = False
+            print("⚠️  Face recognition not available")
+    return _face_classes or None
+
+# Static-scene detection cache: reuse the previous detections when a tiny
+# thumbnail of the frame differs from the last one by less than a mean
+# delta of 3 per channel (compared as an absolute sum to skip the division)
+FRAME_DIFF_SIZE = (16, 12)
+FRAME_DIFF_THRESHOLD = 3 * FRAME_DIFF_SIZE[0] * FRAME_DIFF_SIZE[1] * 3
+
+# Force a garbage collection every N processed frames to cap long-session RSS
+GC_EVERY_N_FRAMES = 500
+
+# Return-path JPEG settings for the browser preview
+JPEG_QUALITY = 75
+JPEG_ENCODE_PARAMS = [
+    cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY,
+    cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+    cv2.IMWRITE_JPEG_PROGRESSIVE, 0
+]
+PREVIEW_MAX_SIZE = (640, 480)
+
+# Reuse cached detections while every tracked intruder is still in its
+# response cooldown and the newest response is younger than this (seconds)
+DETECTION_REUSE_WINDOW = 1.0
+
+# Adaptive frame skipping: process every Nth frame, where N grows with the
+# smoothed face-recognition latency relative to the client's capture interval
+TARGET_FRAME_INTERVAL = 0.1
+LATENCY_EMA_ALPHA = 0.1
+
+# Stale-intruder sweep: run at most every CLEANUP_INTERVAL seconds and forget
+# response bookkeeping for intruders not answered within RESPONSE_TTL seconds
+CLEANUP_INTERVAL = 2.0
+RESPONSE_TTL = 60.0
+
+# Per threat level (index = level - 1): seconds between responses, responding agent
+RESPONSE_INTERVALS = (8, 5, 3, 1)
+THREAT_AGENTS = ("jarvis", "captain_america", "hulk", "thor")
+
+# Socket.IO room that receives activation/deactivation broadcasts
+GUARD_ROOM = 'guards'
 
 # Initialize Flask
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'avengers-guard-secret'
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet')
 
 # Global system state
 class WebGuardSystem:
@@ -47,8 +108,9 @@ class WebGuardSystem:
         self.agent_manager.set_active_agent(self.current_agent)
         
         # Initialize face recognition if available
-        if FACE_RECOGNITION_AVAILABLE:
-            import os
+        face_classes = _get_face_classes()
+        if face_classes:
+            FaceEnrollmentSystem, FaceRecognitionEngine = face_classes
             os.chdir(str(Path(__file__).parent / 'notebooks')) 
 
             self.enrollment = FaceEnrollmentSystem()
@@ -62,9 +124,54 @@ class WebGuardSystem:
         self.is_active = False
         self.frame_count = 0
         self.last_response_time = {}
+        self._last_cleanup = 0.0
+        
+        # Single-slot "latest frame" queue drained by a dedicated inference
+        # worker that owns face_engine, so stale frames are dropped instead of
+        # queueing up and recognition never blocks the websocket handlers
+        # (a green thread under eventlet; heavy work is pushed to tpool)
+        self._frame_queue = queue.Queue(maxsize=1)
+        self._inference_thread = threading.Thread(target=self._inference_worker, daemon=True)
+        self._inference_thread.start()
+        
+        # Detection cache for static scenes
+        self._last_small = None
+        self._last_dets = None
+        self._last_annotated = None
+        
+        # Adaptive frame skipping
+        self._proc_ema = 0.033
+        self._skip_mod = 1
         
         print("✅ Web Guard System initialized")
     
+    def submit_frame(self, frame_data, sid):
+        """Queue the newest frame, dropping any frame not yet processed"""
+        item = (frame_data, sid)
+        try:
+            self._frame_queue.put_nowait(item)
+        except queue.Full:
+            try:
+                self._frame_queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self._frame_queue.put_nowait(item)
+            except queue.Full:
+                pass  # Worker raced us; the frame it took is just as fresh
+    
+    def _inference_worker(self):
+        """Inference thread: always processes the freshest queued frame"""
+        while True:
+            frame_data, sid = self._frame_queue.get()
+            # One bad frame must not kill the only inference thread
+            try:
+                result = self.process_frame(frame_data)
+                socketio.emit('result', result, to=sid)
+            except Exception as e:
+                print(f"❌ Frame processing failed: {e}")
+                socketio.emit('result', {'error': str(e)}, to=sid)
+    
     def activate(self):
         """Activate guard mode"""
         self.state_machine.activate()
@@ -94,36 +201,37 @@ class WebGuardSystem:
         }
     
     def process_frame(self, frame_data):
-        """Process frame from webcam"""
+        """Process frame from webcam (raw JPEG bytes)"""
         self.frame_count += 1
         
-        # Decode base64 frame
+        # Skip frames when recognition can't keep up (before paying for decode)
+        if self.is_active and self.frame_count % self._skip_mod != 0:
+            return {'status': 'skipped', 'frame': frame_data}
+        
+        # Decode raw JPEG bytes sent by the client
         try:
-            img_data = base64.b64decode(frame_data.split(',')[1])
-            nparr = np.frombuffer(img_data, np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            frame = self._decode_jpeg(frame_data)
         except Exception as e:
             return {'error': str(e)}
         
         if not self.is_active:
             return {'status': 'inactive', 'frame': frame_data}
         
-        # Skip frames for performance
-        if self.frame_count % 3 != 0:
-            return {'status': 'skipped', 'frame': frame_data}
-        
         # Process with face recognition
         detections = []
         if self.face_engine:
-            annotated_frame, dets = self.face_engine.process_frame(frame)
+            annotated_frame, dets = self._detect_faces(frame)
+            
+            # Bind hot-loop lookups locally
+            trusted_persons = self.enrollment.trusted_persons
+            get_greeting = self.agent_manager.get_greeting
+            detections_append = detections.append
             
             for det in dets:
                 if det['trusted']:
-                    person = self.enrollment.trusted_persons[det['name']]
-                    agent_name, greeting = self.agent_manager.get_greeting(
-                        det['name'], person.role
-                    )
-                    detections.append({
+                    person = trusted_persons[det['name']]
+                    agent_name, greeting = get_greeting(det['name'], person.role)
+                    detections_append({
                         'type': 'trusted',
                         'name': det['name'],
                         'role': person.role,
@@ -134,15 +242,29 @@ class WebGuardSystem:
                     # Handle intruder
                     response_data = self._handle_intruder(det, frame)
                     if response_data:
-                        detections.append(response_data)
+                        detections_append(response_data)
             
-            # Encode annotated frame back to base64
-            _, buffer = cv2.imencode('.jpg', annotated_frame)
-            frame_base64 = base64.b64encode(buffer).decode('utf-8')
-            frame_data = f"data:image/jpeg;base64,{frame_base64}"
+            # Downscale to preview size, then encode back to raw JPEG bytes
+            height, width = annotated_frame.shape[:2]
+            scale = min(PREVIEW_MAX_SIZE[0] / width, PREVIEW_MAX_SIZE[1] / height)
+            if scale < 1.0:
+                annotated_frame = cv2.resize(
+                    annotated_frame, (int(width * scale), int(height * scale)),
+                    interpolation=cv2.INTER_AREA
+                )
+            frame_data = self._encode_jpeg(annotated_frame)
+            del annotated_frame
         
-        # Cleanup old intruders
-        self.state_machine.cleanup_old_intruders()
+        # Drop per-frame arrays promptly instead of waiting for the next frame
+        del frame
+        if self.frame_count % GC_EVERY_N_FRAMES == 0:
+            gc.collect()
+        
+        # Cleanup old intruders (throttled)
+        now = time.monotonic()
+        if now - self._last_cleanup > CLEANUP_INTERVAL:
+            self._last_cleanup = now
+            self._cleanup()
         
         return {
             'status': 'processed',
@@ -151,12 +273,97 @@ class WebGuardSystem:
             'current_agent': self.current_agent
         }
     
+    @staticmethod
+    def _decode_jpeg(data):
+        """Decode JPEG bytes to a BGR frame"""
+        if _turbo_jpeg is not None:
+            return _turbo_jpeg.decode(data)
+        return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    
+    @staticmethod
+    def _encode_jpeg(frame):
+        """Encode a BGR frame to JPEG bytes"""
+        if _turbo_jpeg is not None:
+            return _turbo_jpeg.encode(frame, quality=JPEG_QUALITY)
+        _, buffer = cv2.imencode('.jpg', frame, JPEG_ENCODE_PARAMS)
+        return buffer.tobytes()
+    
+    def _cleanup(self):
+        """Drop departed intruders and stale per-intruder response state"""
+        self.state_machine.cleanup_old_intruders()
+        self.agent_manager.flush_logs()
+        
+        current_time = time.time()
+        self.last_response_time = {
+            iid: t for iid, t in self.last_response_time.items()
+            if current_time - t < RESPONSE_TTL
+        }
+    
+    def _detect_faces(self, frame):
+        """Run face recognition, reusing cached results when the scene is static"""
+        if self._last_dets and self._intruders_in_cooldown(self._last_dets):
+            return self._last_annotated, self._last_dets
+        
+        small = cv2.resize(frame, FRAME_DIFF_SIZE, interpolation=cv2.INTER_AREA).astype(np.int16)
+        
+        if self._last_small is not None:
+            diff = int(np.abs(small - self._last_small).sum())
+            if diff < FRAME_DIFF_THRESHOLD:
+                return self._last_annotated, self._last_dets
+        
+        start = time.perf_counter()
+        # Run recognition on a native thread so OpenCV/dlib work, which
+        # releases the GIL, doesn't stall the eventlet hub serving clients
+        annotated_frame, dets = tpool.execute(self.face_engine.process_frame, frame)
+        elapsed = time.perf_counter() - start
+        
+        self._proc_ema += LATENCY_EMA_ALPHA * (elapsed - self._proc_ema)
+        self._skip_mod = max(1, int(self._proc_ema / TARGET_FRAME_INTERVAL) + 1)
+        
+        self._last_small = small
+        self._last_dets = dets
+        self._last_annotated = annotated_frame
+        return annotated_frame, dets
+    
+    def _intruders_in_cooldown(self, dets):
+        """True if every cached detection is an intruder that can't be answered yet"""
+        if not self.last_response_time:
+            return False
+        
+        current_time = time.time()
+        if current_time - max(self.last_response_time.values()) >= DETECTION_REUSE_WINDOW:
+            return False
+        
+        for det in dets:
+            if det['trusted']:
+                return False
+            
+            intruder_id = self._intruder_id(det['location'])
+            last_response = self.last_response_time.get(intruder_id)
+            intruder = self.state_machine.intruders.get(intruder_id)
+            if last_response is None or intruder is None:
+                return False
+            
+            interval = RESPONSE_INTERVALS[intruder.threat_level_int - 1]
+            if current_time - last_response >= interval:
+                return False
+        
+        return True
+    
+    @staticmethod
+    def _intruder_id(loc):
+        """
+        Integer tracking key for an intruder's face location
+        
+        Packs (top, right) snapped to a 16-pixel grid into one int, which is
+        cheaper to hash than a formatted string and merges jittering boxes
+        """
+        return ((int(loc[0]) >> 4) & 0xFFFF) << 16 | ((int(loc[1]) >> 4) & 0xFFFF)
+    
     def _handle_intruder(self, detection, frame):
         """Handle intruder detection"""
-        import time
-        
         loc = detection['location']
-        intruder_id = f"intruder_{loc[0]}_{loc[1]}"
+        intruder_id = self._intruder_id(loc)
         
         # Process in state machine
         info = self.state_machine.process_detection(intruder_id, loc)
@@ -167,20 +374,17 @@ class WebGuardSystem:
         current_time = time.time()
         if intruder_id in self.last_response_time:
             time_since = current_time - self.last_response_time[intruder_id]
-            intervals = {1: 8, 2: 5, 3: 3, 4: 1}
-            if time_since < intervals.get(threat_level, 5):
+            if time_since < RESPONSE_INTERVALS[threat_level - 1]:
                 return None
         
         # Select agent
-        agent_map = {1: "jarvis", 2: "captain_america", 3: "hulk", 4: "thor"}
-        selected_agent = agent_map.get(threat_level, "jarvis")
+        selected_agent = THREAT_AGENTS[threat_level - 1]
         
         if selected_agent != self.current_agent:
             self.current_agent = selected_agent
             self.agent_manager.set_active_agent(selected_agent)
         
-        # Get response
-        from src.agents.base_agent import InteractionContext
+        # Get response (a fresh context each time, since agents log it by reference)
         context = InteractionContext(
             person_name=None,
             is_trusted=False,
@@ -241,10 +445,15 @@ def deactivate():
     return jsonify(result)
 
 # WebSocket events
+def _broadcast_payload(result):
+    """Slim payload for room broadcasts; clients poll /api/status for stats"""
+    return {'agent': result['agent'], 'message': result['message']}
+
 @socketio.on('connect')
 def handle_connect():
     """Client connected"""
     print('Client connected')
+    join_room(GUARD_ROOM)
     emit('status', guard_system.get_status())
 
 @socketio.on('disconnect')
@@ -254,21 +463,20 @@ def handle_disconnect():
 
 @socketio.on('frame')
 def handle_frame(data):
-    """Process video frame"""
-    result = guard_system.process_frame(data['frame'])
-    emit('result', result)
+    """Queue video frame for the background worker (drops stale frames)"""
+    guard_system.submit_frame(data, request.sid)
 
 @socketio.on('activate')
 def handle_activate():
     """Activate via websocket"""
     result = guard_system.activate()
-    emit('activation_result', result, broadcast=True)
+    socketio.emit('activation_result', _broadcast_payload(result), to=GUARD_ROOM)
 
 @socketio.on('deactivate')
 def handle_deactivate():
     """Deactivate via websocket"""
     result = guard_system.deactivate()
-    emit('deactivation_result', result, broadcast=True)
+    socketio.emit('deactivation_result', _broadcast_payload(result), to=GUARD_ROOM)
 
 if __name__ == '__main__':
     print("\n🦾 Starting Avengers Guard Web Interface...")
@@ -276,4 +484,4 @@ if __name__ == '__main__':
     print("Open browser to: http://localhost:5000")
     print("="*60 + "\n")
     
-    socketio.run(app, debug=False, host='127.0.0.1', port=5000, use_reloader=False)
\ No newline at end of file
+    eventlet.wsgi.server(eventlet.listen(('127.0.0.1', 5000)), app)
\ No newline at end of file
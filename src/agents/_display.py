@@ -0,0 +1,11 @@
+"""
+Display constants shared by the agent demos
+"""
+
+BANNER = "=" * 60
+
+GREET_OWNER_HDR = "\n👤 Greeting Owner:"
+GREET_FRIEND_HDR = "\n👤 Greeting Friend:"
+ESCALATION_HDR = "\n⚠️  Intruder Escalation:"
+ACTIVATION_HDR = "\n🔒 Activation:"
+DEACTIVATION_HDR = "\n🔓 Deactivation:"
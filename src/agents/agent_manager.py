@@ -5,6 +5,8 @@ Handles rotation and selection logic for guard agents
 
 from typing import Optional, Dict, List
 import random
+from itertools import chain
+from ._display import BANNER
 from .base_agent import BaseGuardAgent, InteractionContext, ThreatLevel
 from .iron_man import JarvisAgent
 from .captain_america import CaptainAmericaAgent
@@ -43,6 +45,23 @@ class AgentManager:
         self.agent_keys = list(self.agents.keys())
         self.active_agent: Optional[BaseGuardAgent] = None
         
+        # Threat level -> agent for "threat_based" rotation
+        self._threat_agent_map: Dict[ThreatLevel, BaseGuardAgent] = {
+            ThreatLevel.LEVEL_1_INQUIRY: self.agents["jarvis"],           # Polite inquiry
+            ThreatLevel.LEVEL_2_WARNING: self.agents["captain_america"],  # Warnings
+            ThreatLevel.LEVEL_3_ALERT: self.agents["hulk"],               # Serious threats
+            ThreatLevel.LEVEL_4_ALARM: self.agents["thor"]                # Final alarm
+        }
+        
+        # Rotation mode -> selection method
+        self._rotation_dispatch = {
+            "fixed": self._select_fixed,
+            "random": self._select_random,
+            "round_robin": self._select_round_robin,
+            "threat_based": self._select_threat_based,
+            "personality_based": self._select_personality_based
+        }
+        
         # Set default agent
         self.set_active_agent("jarvis")
     
@@ -74,45 +93,37 @@ class AgentManager:
         Returns:
             Selected agent
         """
-        if self.rotation_mode == "fixed":
-            return self.active_agent
-        
-        elif self.rotation_mode == "random":
-            return random.choice(list(self.agents.values()))
-        
-        elif self.rotation_mode == "round_robin":
-            agent = self.agents[self.agent_keys[self.current_agent_index]]
-            self.current_agent_index = (self.current_agent_index + 1) % len(self.agent_keys)
-            return agent
-        
-        elif self.rotation_mode == "threat_based":
-            # JARVIS for polite inquiry
-            if context.threat_level == ThreatLevel.LEVEL_1_INQUIRY:
-                return self.agents["jarvis"]
-            # Captain America for warnings
-            elif context.threat_level == ThreatLevel.LEVEL_2_WARNING:
-                return self.agents["captain_america"]
-            # Hulk for serious threats
-            elif context.threat_level == ThreatLevel.LEVEL_3_ALERT:
-                return self.agents["hulk"]
-            # Thor for final alarm
-            else:
-                return self.agents["thor"]
-        
-        elif self.rotation_mode == "personality_based":
-            # Smart selection based on time of day or context
-            # Sophisticated: JARVIS, Thor
-            # Direct: Captain America, Black Widow
-            # Aggressive: Hulk
-            if context.interaction_count == 1:
-                return random.choice([self.agents["jarvis"], self.agents["thor"]])
-            elif context.interaction_count == 2:
-                return random.choice([self.agents["captain_america"], self.agents["black_widow"]])
-            else:
-                return self.agents["hulk"]
-        
+        return self._rotation_dispatch.get(self.rotation_mode, self._select_fixed)(context)
+    
+    def _select_fixed(self, context: InteractionContext) -> BaseGuardAgent:
+        """Always use the active agent"""
+        return self.active_agent
+    
+    def _select_random(self, context: InteractionContext) -> BaseGuardAgent:
+        """Pick any agent at random"""
+        return random.choice(list(self.agents.values()))
+    
+    def _select_round_robin(self, context: InteractionContext) -> BaseGuardAgent:
+        """Rotate through agents in order"""
+        agent = self.agents[self.agent_keys[self.current_agent_index]]
+        self.current_agent_index = (self.current_agent_index + 1) % len(self.agent_keys)
+        return agent
+    
+    def _select_threat_based(self, context: InteractionContext) -> BaseGuardAgent:
+        """Escalate through agents with the threat level"""
+        return self._threat_agent_map.get(context.threat_level, self.agents["thor"])
+    
+    def _select_personality_based(self, context: InteractionContext) -> BaseGuardAgent:
+        """Pick by personality type for the interaction count"""
+        # Sophisticated: JARVIS, Thor
+        # Direct: Captain America, Black Widow
+        # Aggressive: Hulk
+        if context.interaction_count == 1:
+            return random.choice([self.agents["jarvis"], self.agents["thor"]])
+        elif context.interaction_count == 2:
+            return random.choice([self.agents["captain_america"], self.agents["black_widow"]])
         else:
-            return self.active_agent
+            return self.agents["hulk"]
     
     def get_greeting(self, person_name: str, role: str, agent_name: Optional[str] = None) -> tuple:
         """
@@ -162,14 +173,14 @@ class AgentManager:
     
     def list_agents(self):
         """Display all available agents"""
-        print("\n" + "="*60)
+        print("\n" + BANNER)
         print("🦸 AVAILABLE AVENGERS GUARD AGENTS")
-        print("="*60)
+        print(BANNER)
         for key, agent in self.agents.items():
             status = "✓ ACTIVE" if agent == self.active_agent else ""
             print(f"\n🤖 {agent.agent_name} ({key}) {status}")
             print(f"   {agent.get_personality_description()}")
-        print("="*60 + "\n")
+        print(BANNER + "\n")
     
     def set_rotation_mode(self, mode: str):
         """
@@ -178,31 +189,37 @@ class AgentManager:
         Args:
             mode: random, round_robin, threat_based, personality_based, or fixed
         """
-        valid_modes = ["random", "round_robin", "threat_based", "personality_based", "fixed"]
+        valid_modes = list(self._rotation_dispatch)
         if mode in valid_modes:
             self.rotation_mode = mode
             print(f"✅ Rotation mode set to: {mode}")
         else:
             print(f"❌ Invalid mode. Choose from: {valid_modes}")
     
+    def flush_logs(self):
+        """Flush buffered interactions of all agents into their histories"""
+        for agent in self.agents.values():
+            agent.flush_logs()
+    
     def get_all_interaction_history(self) -> List[Dict]:
         """Get interaction history from all agents"""
-        all_history = []
-        for agent in self.agents.values():
-            all_history.extend(agent.interaction_history)
-        return all_history
+        self.flush_logs()
+        return list(chain.from_iterable(
+            agent.interaction_history for agent in self.agents.values()
+        ))
     
     def reset_all_histories(self):
         """Clear interaction history for all agents"""
         for agent in self.agents.values():
-            agent.interaction_history = []
+            agent.flush_logs()
+            agent.interaction_history.clear()
         print("✅ All agent interaction histories cleared")
 
 
 # Test and demonstration
 if __name__ == "__main__":
     print("🦸 AVENGERS AGENT MANAGER TEST\n")
-    print("="*60)
+    print(BANNER)
     
     # Create manager
     manager = AgentManager(rotation_mode="threat_based")
@@ -212,7 +229,7 @@ if __name__ == "__main__":
     
     # Test greetings
     print("\n📣 TESTING GREETINGS:")
-    print("="*60)
+    print(BANNER)
     for agent_key in ["jarvis", "captain_america", "black_widow"]:
         agent_name, greeting = manager.get_greeting("Tony Stark", "owner", agent_key)
         print(f"\n{agent_name}:")
@@ -220,7 +237,7 @@ if __name__ == "__main__":
     
     # Test intruder escalation with threat-based selection
     print("\n\n⚠️  TESTING INTRUDER ESCALATION (Threat-Based):")
-    print("="*60)
+    print(BANNER)
     
     for level in ThreatLevel:
         context = InteractionContext(
@@ -238,18 +255,18 @@ if __name__ == "__main__":
     
     # Test activation/deactivation
     print("\n\n🔒 TESTING ACTIVATION:")
-    print("="*60)
+    print(BANNER)
     agent_name, msg = manager.get_activation_message()
     print(f"{agent_name}: {msg}")
     
     print("\n🔓 TESTING DEACTIVATION:")
-    print("="*60)
+    print(BANNER)
     agent_name, msg = manager.get_deactivation_message()
     print(f"{agent_name}: {msg}")
     
     # Test different rotation modes
     print("\n\n🔄 TESTING ROTATION MODES:")
-    print("="*60)
+    print(BANNER)
     
     manager.set_rotation_mode("random")
     print("\nRandom mode - 3 greetings:")
@@ -271,4 +288,4 @@ if __name__ == "__main__":
         agent_name, response = manager.get_intruder_response(context)
         print(f"  {i+1}. {agent_name}")
     
-    print("\n" + "="*60)
\ No newline at end of file
+    print("\n" + BANNER)
\ No newline at end of file
@@ -4,12 +4,15 @@ Defines the personality and behavior interface for all guard agents
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from collections import deque
+from functools import lru_cache
+import random
+from typing import List, Mapping, Optional, Tuple
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
 
 
-class ThreatLevel(Enum):
+class ThreatLevel(IntEnum):
     """Escalation levels for intruder interaction"""
     LEVEL_1_INQUIRY = 1      # Polite questioning
     LEVEL_2_WARNING = 2      # Firm warning
@@ -17,7 +20,7 @@ class ThreatLevel(Enum):
     LEVEL_4_ALARM = 4        # Final warning / alarm
 
 
-@dataclass
+@dataclass(slots=True)
 class InteractionContext:
     """Context for agent interactions"""
     person_name: Optional[str]
@@ -28,23 +31,61 @@ class InteractionContext:
     previous_responses: List[str]
 
 
+def split_templates(templates: Tuple[str, ...]) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """
+    Pre-split single-placeholder greeting templates around "{name}"
+    
+    Returns (prefix, suffix) pairs; suffix is None for templates without a name
+    """
+    pairs = []
+    for template in templates:
+        prefix, placeholder, suffix = template.partition("{name}")
+        pairs.append((prefix, suffix) if placeholder else (template, None))
+    return tuple(pairs)
+
+
+@lru_cache(maxsize=128)
+def format_greetings(split: Tuple[Tuple[str, Optional[str]], ...],
+                     person_name: str) -> Tuple[str, ...]:
+    """
+    Fill pre-split greeting templates with a person's name
+    
+    Cached, so recurring visitors only pay the formatting cost once
+    """
+    return tuple(
+        prefix if suffix is None else prefix + person_name + suffix
+        for prefix, suffix in split
+    )
+
+
 class BaseGuardAgent(ABC):
     """
     Abstract base class for all Avengers guard agents
     Each agent has a unique personality and interaction style
     """
     
-    def __init__(self, agent_name: str, personality_traits: Dict[str, str]):
+    # Interactions kept per agent (oldest dropped first)
+    MAX_HISTORY = 500
+    
+    # Interactions buffered on the hot path before flush_logs() moves them
+    # (a full buffer is flushed straight away, so nothing is dropped)
+    LOG_BUFFER_SIZE = 256
+    
+    def __init__(self, agent_name: str, personality_traits: Mapping[str, str]):
         """
         Initialize guard agent
         
         Args:
             agent_name: Name of the agent (e.g., "JARVIS", "FRIDAY")
-            personality_traits: Dict describing personality
+            personality_traits: Mapping describing personality
         """
         self.agent_name = agent_name
         self.personality_traits = personality_traits
-        self.interaction_history = []
+        self.interaction_history = deque(maxlen=self.MAX_HISTORY)
+        self._log_buffer = deque()
+        
+        # Private RNG so agents don't share (or contend on) the global state
+        self._rng = random.Random()
     
     @abstractmethod
     def get_greeting(self, person_name: str, role: str) -> str:
@@ -107,6 +148,27 @@ class BaseGuardAgent(ABC):
             'agent': self.agent_name
         })
     
+    def _buffer_interaction(self, entry: Tuple[InteractionContext, str]):
+        """Queue a (context, response) pair, flushing once the buffer is full"""
+        buffer = self._log_buffer
+        buffer.append(entry)
+        if len(buffer) >= self.LOG_BUFFER_SIZE:
+            self.flush_logs()
+    
+    def _buffer_interactions(self, entries):
+        """Queue several (context, response) pairs, flushing once the buffer is full"""
+        buffer = self._log_buffer
+        buffer.extend(entries)
+        if len(buffer) >= self.LOG_BUFFER_SIZE:
+            self.flush_logs()
+    
+    def flush_logs(self):
+        """Move interactions buffered on the hot path into interaction_history"""
+        buffer = self._log_buffer
+        while buffer:
+            context, response = buffer.popleft()
+            self.log_interaction(context, response)
+    
     def get_system_prompt(self) -> str:
         """
         Get system prompt for LLM integration (Milestone 3)
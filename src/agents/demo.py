@@ -0,0 +1,118 @@
+"""
+Agent Demo
+Console walkthrough of each guard agent's dialogue
+Run with: python -m src.agents.demo [captain_america|hulk|jarvis|thor|black_widow]
+"""
+
+import sys
+
+from ._display import (
+    ACTIVATION_HDR, BANNER, DEACTIVATION_HDR, ESCALATION_HDR,
+    GREET_FRIEND_HDR, GREET_OWNER_HDR,
+)
+from .base_agent import InteractionContext, ThreatLevel
+from .black_widow import BlackWidowAgent
+from .captain_america import CaptainAmericaAgent
+from .hulk import HulkAgent
+from .iron_man import JarvisAgent
+from .thor import ThorAgent
+
+
+def _widow_analysis(widow: BlackWidowAgent) -> str:
+    context = InteractionContext(
+        person_name=None,
+        is_trusted=False,
+        threat_level=ThreatLevel.LEVEL_2_WARNING,
+        interaction_count=2,
+        time_since_first_detection=15.0,
+        previous_responses=[]
+    )
+    return widow.analyze_threat(context)
+
+
+# name -> (agent class, title, [(header, person, role)], [(header, extra)])
+DEMOS = {
+    "captain_america": (
+        CaptainAmericaAgent,
+        "🛡️  CAPTAIN AMERICA Agent Test\n",
+        [(GREET_OWNER_HDR, "Steve", "owner"),
+         (GREET_FRIEND_HDR, "Bucky", "friend")],
+        [("\n💪 Motivational Quote:", CaptainAmericaAgent.get_motivational_quote)],
+    ),
+    "hulk": (
+        HulkAgent,
+        "💚 HULK Agent Test\n",
+        [(GREET_OWNER_HDR, "Bruce", "owner"),
+         (GREET_FRIEND_HDR, "Tony", "friend")],
+        [("\n💪 Hulk Quote:", HulkAgent.get_angry_quote)],
+    ),
+    "jarvis": (
+        JarvisAgent,
+        "🤖 JARVIS Agent Test\n",
+        [(GREET_OWNER_HDR, "Tony", "owner")],
+        [],
+    ),
+    "thor": (
+        ThorAgent,
+        "⚡ THOR Agent Test\n",
+        [(GREET_OWNER_HDR, "Thor Odinson", "owner"),
+         (GREET_FRIEND_HDR, "Loki", "friend")],
+        [("\n⚡ Battle Cry:", ThorAgent.get_battle_cry),
+         ("\n🌩️  Lightning Warning:", ThorAgent.summon_lightning_warning)],
+    ),
+    "black_widow": (
+        BlackWidowAgent,
+        "🕷️  BLACK WIDOW Agent Test\n",
+        [(GREET_OWNER_HDR, "Natasha", "owner"),
+         (GREET_FRIEND_HDR, "Clint", "friend")],
+        [("\n🎯 Threat Analysis:", _widow_analysis)],
+    ),
+}
+
+
+def run_demo(name: str):
+    """
+    Print one agent's greetings, escalation, activation and flavor lines
+    
+    Args:
+        name: Key in DEMOS
+    """
+    agent_class, title, greetings, extras = DEMOS[name]
+    agent = agent_class()
+    
+    print(title)
+    print(BANNER)
+    
+    for header, person, role in greetings:
+        print(header)
+        print(agent.get_greeting(person, role))
+    
+    print(ESCALATION_HDR)
+    for level in ThreatLevel:
+        context = InteractionContext(
+            person_name=None,
+            is_trusted=False,
+            threat_level=level,
+            interaction_count=level.value,
+            time_since_first_detection=level.value * 10.0,
+            previous_responses=[]
+        )
+        print(f"\n{level.name}:")
+        print(agent.get_intruder_response(context))
+    
+    print(ACTIVATION_HDR)
+    print(agent.get_activation_message())
+    
+    print(DEACTIVATION_HDR)
+    print(agent.get_deactivation_message())
+    
+    for header, extra in extras:
+        print(header)
+        print(extra(agent))
+    
+    print("\n" + BANNER)
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or DEMOS:
+        run_demo(name)
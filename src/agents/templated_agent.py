@@ -0,0 +1,112 @@
+"""
+Templated Guard Agent
+Data-driven agent implementation shared by all Avengers guard agents
+Each agent supplies its dialogue as a GuardTemplates blob
+"""
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+from .base_agent import BaseGuardAgent, InteractionContext, format_greetings, split_templates
+
+# Every core template tuple holds exactly this many lines, so picks are getrandbits(2)
+TEMPLATE_COUNT = 4
+
+
+@dataclass(frozen=True)
+class GuardTemplates:
+    """Dialogue data for one guard agent"""
+    agent_name: str
+    personality_traits: Mapping[str, str]            # frozen into a read-only view
+    greetings: Dict[str, Tuple[str, ...]]            # role -> templates with a {name} placeholder
+    responses_by_level: Tuple[Tuple[str, ...], ...]  # index = ThreatLevel - 1
+    activation_messages: Tuple[str, ...]
+    deactivation_messages: Tuple[str, ...]
+    extras: Dict[str, Tuple[str, ...]] = field(default_factory=dict)  # optional flavor lines
+    split_greetings: Dict[str, tuple] = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        core = {
+            **{f"greetings[{role!r}]": lines for role, lines in self.greetings.items()},
+            **{f"responses_by_level[{i}]": lines for i, lines in enumerate(self.responses_by_level)},
+            "activation_messages": self.activation_messages,
+            "deactivation_messages": self.deactivation_messages,
+        }
+        for key, lines in core.items():
+            if len(lines) != TEMPLATE_COUNT:
+                raise ValueError(f"{self.agent_name}: {key} needs {TEMPLATE_COUNT} lines, got {len(lines)}")
+        
+        # One read-only traits view shared by every instance of the agent
+        object.__setattr__(self, "personality_traits",
+                           MappingProxyType(dict(self.personality_traits)))
+        
+        # Greetings pre-split around {name} so formatting is a plain concat
+        object.__setattr__(self, "split_greetings", {
+            role: split_templates(templates) for role, templates in self.greetings.items()
+        })
+
+
+class TemplatedGuardAgent(BaseGuardAgent):
+    """
+    Guard agent whose personality lives entirely in its templates
+    Subclasses only bind their GuardTemplates and expose flavor helpers
+    """
+    
+    def __init__(self, templates: GuardTemplates):
+        """
+        Initialize templated agent
+        
+        Args:
+            templates: Dialogue data for this agent
+        """
+        super().__init__(templates.agent_name, templates.personality_traits)
+        self.templates = templates
+        self._pick = self._rng.choices
+        self._pick4 = self._rng.getrandbits  # _pick4(2) -> uniform index 0-3
+    
+    def get_greeting(self, person_name: str, role: str) -> str:
+        """Greeting from the role's templates, filled with the person's name"""
+        greetings = self.templates.split_greetings
+        split = greetings.get(role) or greetings["friend"]
+        return format_greetings(split, person_name)[self._pick4(2)]
+    
+    def get_intruder_response(self, context: InteractionContext) -> str:
+        """Response for the context's threat level"""
+        responses = self.templates.responses_by_level[context.threat_level - 1]
+        response = responses[self._pick4(2)]
+        self._buffer_interaction((context, response))
+        return response
+    
+    def get_intruder_responses(self, contexts: Sequence[InteractionContext]) -> List[str]:
+        """
+        Responses for a batch of contexts (e.g. several intruders in one frame)
+        
+        Args:
+            contexts: Interaction contexts to respond to
+            
+        Returns:
+            One response per context, in order
+        """
+        by_level = self.templates.responses_by_level
+        pick4 = self._pick4
+        responses = [by_level[context.threat_level - 1][pick4(2)] for context in contexts]
+        self._buffer_interactions(zip(contexts, responses))
+        return responses
+    
+    def get_activation_message(self) -> str:
+        """Message when guard mode is activated"""
+        return self.templates.activation_messages[self._pick4(2)]
+    
+    def get_deactivation_message(self) -> str:
+        """Message when guard mode is deactivated"""
+        return self.templates.deactivation_messages[self._pick4(2)]
+    
+    def get_extra(self, kind: str) -> str:
+        """
+        Get a flavor line (quote, battle cry, ...) from the agent's extras
+        
+        Args:
+            kind: Key in the agent's extras (e.g. "quotes")
+        """
+        return self._pick(self.templates.extras[kind])[0]
@@ -5,10 +5,15 @@ Plays agent-specific sounds and system alerts
 
 import pygame
 import os
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 import time
 
+from src.core.guard_log import get_logger
+
+logger = get_logger("sound_effects")
+
 
 class SoundEffectsManager:
     """
@@ -16,65 +21,176 @@ class SoundEffectsManager:
     Plays agent-specific sounds, alerts, and themes
     """
     
-    def __init__(self, sounds_dir: str = "sounds", volume: float = 0.7):
+    # Sound name prefix -> dedicated mixer channel, so agents never cut each other off
+    _FREE_CHANNELS = 8  # Unreserved channels left for other Sound.play() callers (e.g. TTS)
+    _CHANNEL_IDS = {
+        "jarvis": 0,
+        "cap": 1,
+        "widow": 2,
+        "hulk": 3,
+        "thor": 4,
+        "system": 5,
+        "avengers": 6,  # theme
+        "alarm": 7
+    }
+    
+    # Agent name -> sound, keyed by the common spellings so lookups skip .lower()
+    _ACTIVATION_MAP = {
+        key: sound
+        for base, sound in (("jarvis", "jarvis_activate"), ("captain_america", "cap_activate"),
+                            ("hulk", "hulk_activate"), ("thor", "thor_activate"))
+        for key in (base, base.title(), base.upper())
+    }
+    _ALERT_MAP = {
+        key: sound
+        for base, sound in (("jarvis", "jarvis_alert"), ("captain_america", "cap_alert"),
+                            ("hulk", "hulk_alert"), ("thor", "thor_alert"))
+        for key in (base, base.title(), base.upper())
+    }
+    
+    # (sound name, folder, file) for every sound the system knows about
+    _SOUND_SPEC = (
+        # Agent activation sounds
+        ("jarvis_activate", "agents", "jarvis_activate.mp3"),
+        ("cap_activate", "agents", "cap_shield.mp3"),
+        ("widow_activate", "agents", "widow_stealth.mp3"),
+        ("hulk_activate", "agents", "hulk_roar.mp3"),
+        ("thor_activate", "agents", "thor_thunder.mp3"),
+        
+        # Agent alert sounds
+        ("jarvis_alert", "agents", "jarvis_alert.mp3"),
+        ("cap_alert", "agents", "cap_shield.mp3"),
+        ("widow_alert", "agents", "widow_stealth.mp3"),
+        ("hulk_alert", "agents", "hulk_smash.mp3"),
+        ("thor_alert", "agents", "thor_mjolnir.mp3"),
+        
+        # System sounds
+        ("system_beep", "system", "beep.mp3"),
+        ("system_alert", "system", "alert.mp3"),
+        ("system_alarm", "system", "alarm.mp3"),
+        
+        # Theme music
+        ("avengers_theme", "themes", "avengers_theme.mp3"),
+        ("alarm_siren", "themes", "alarm_siren.mp3")
+    )
+    
+    def __init__(self, sounds_dir: str = "sounds", volume: float = 0.7,
+                 frequency: int = 44100, buffer: int = 512,
+                 cache_dir: Optional[str] = None):
         """
         Initialize sound effects manager
         
         Args:
             sounds_dir: Directory containing sound files
             volume: Default volume (0.0 to 1.0)
+            frequency: Mixer sample rate (Hz)
+            buffer: Mixer buffer size in samples (small = low latency; raise on underruns)
+            cache_dir: Where decoded WAV copies go (default: next to each MP3)
         """
         self.sounds_dir = Path(sounds_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.frequency = frequency
         self.volume = volume
+        self._threat_volume = self._threat_volumes(volume)
         self.enabled = True
         
-        # Initialize pygame mixer
+        # Initialize pygame mixer with a small buffer so effects start promptly
         try:
-            pygame.mixer.init()
+            try:
+                pygame.mixer.pre_init(frequency=frequency, size=-16, channels=2, buffer=buffer)
+                pygame.mixer.init()
+            except pygame.error:
+                # Device rejected the small buffer; fall back to a safer size
+                pygame.mixer.pre_init(frequency=frequency, size=-16, channels=2, buffer=1024)
+                pygame.mixer.init()
             self.mixer_available = True
-            print("✅ Sound system initialized")
+            logger.info("✅ Sound system initialized")
         except Exception as e:
-            print(f"⚠️  Sound system unavailable: {e}")
+            logger.warning("⚠️  Sound system unavailable: %s", e)
             self.mixer_available = False
         
-        # Sound file paths
-        self.sounds = {
-            # Agent activation sounds
-            "jarvis_activate": self.sounds_dir / "agents" / "jarvis_activate.mp3",
-            "cap_activate": self.sounds_dir / "agents" / "cap_shield.mp3",
-            "widow_activate": self.sounds_dir / "agents" / "widow_stealth.mp3",
-            "hulk_activate": self.sounds_dir / "agents" / "hulk_roar.mp3",
-            "thor_activate": self.sounds_dir / "agents" / "thor_thunder.mp3",
-            
-            # Agent alert sounds
-            "jarvis_alert": self.sounds_dir / "agents" / "jarvis_alert.mp3",
-            "cap_alert": self.sounds_dir / "agents" / "cap_shield.mp3",
-            "widow_alert": self.sounds_dir / "agents" / "widow_stealth.mp3",
-            "hulk_alert": self.sounds_dir / "agents" / "hulk_smash.mp3",
-            "thor_alert": self.sounds_dir / "agents" / "thor_mjolnir.mp3",
-            
-            # System sounds
-            "system_beep": self.sounds_dir / "system" / "beep.mp3",
-            "system_alert": self.sounds_dir / "system" / "alert.mp3",
-            "system_alarm": self.sounds_dir / "system" / "alarm.mp3",
-            
-            # Theme music
-            "avengers_theme": self.sounds_dir / "themes" / "avengers_theme.mp3",
-            "alarm_siren": self.sounds_dir / "themes" / "alarm_siren.mp3"
-        }
-        
-        # Check which sounds are available
+        # Decode every available sound once so playback is just a buffer submit
         self.available_sounds = {}
-        for name, path in self.sounds.items():
-            if path.exists():
-                self.available_sounds[name] = path
+        self._sound_objects = {}
+        self._channels = {}
+        self._sound_channels = {}
+        if self.mixer_available:
+            # Check which sounds are available (one directory scan per folder, not a stat per file)
+            for name, path in self.sounds.items():
+                if path in self._present_files:
+                    self.available_sounds[name] = path
+            
+            # Reserve the category channels so free play() calls elsewhere in the
+            # process only ever land on the extra channels above them
+            pygame.mixer.set_num_channels(len(self._CHANNEL_IDS) + self._FREE_CHANNELS)
+            pygame.mixer.set_reserved(len(self._CHANNEL_IDS))
+            self._channels = {
+                category: pygame.mixer.Channel(channel_id)
+                for category, channel_id in self._CHANNEL_IDS.items()
+            }
+            for name, path in self.available_sounds.items():
+                try:
+                    self._sound_objects[name] = pygame.mixer.Sound(str(self._decoded_path(path)))
+                    self._sound_channels[name] = self._channels[name.split("_", 1)[0]]
+                except Exception as e:
+                    logger.warning("⚠️  Could not load sound %s: %s", name, e)
         
         if self.available_sounds:
-            print(f"✅ Loaded {len(self.available_sounds)} sound effects")
-        else:
-            print("⚠️  No sound files found. Please download and place in 'sounds/' directory")
+            logger.info("✅ Loaded %d sound effects", len(self._sound_objects))
+        elif self.mixer_available:
+            logger.warning("⚠️  No sound files found. Please download and place in 'sounds/' directory")
+    
+    @cached_property
+    def sounds(self) -> dict:
+        """Sound name -> file path, built on first use"""
+        return {name: self.sounds_dir / folder / filename for name, folder, filename in self._SOUND_SPEC}
+    
+    @cached_property
+    def _present_files(self) -> set:
+        """Paths of every file in the sound folders"""
+        present = set()
+        for directory in {path.parent for path in self.sounds.values()}:
+            try:
+                with os.scandir(directory) as entries:
+                    present.update(directory / entry.name for entry in entries)
+            except FileNotFoundError:
+                pass
+        return present
     
-    def play_sound(self, sound_name: str, volume: Optional[float] = None, wait: bool = False) -> bool:
+    def _decoded_path(self, path: Path) -> Path:
+        """
+        WAV copy of an MP3, decoded once and cached on disk
+        
+        Falls back to the MP3 itself when pydub (or ffmpeg) is unavailable
+        """
+        if path.suffix.lower() != ".mp3":
+            return path
+        
+        wav_dir = self.cache_dir / path.parent.name if self.cache_dir else path.parent
+        wav_path = wav_dir / path.with_suffix(".wav").name
+        try:
+            if wav_path.stat().st_mtime >= path.stat().st_mtime:
+                return wav_path
+        except FileNotFoundError:
+            pass
+        
+        try:
+            from pydub import AudioSegment
+            
+            wav_dir.mkdir(parents=True, exist_ok=True)
+            (AudioSegment.from_mp3(str(path))
+                .set_frame_rate(self.frequency)
+                .set_channels(2)
+                .export(str(wav_path), format="wav"))
+            return wav_path
+        except ImportError:
+            return path
+        except Exception as e:
+            logger.warning("⚠️  Could not decode %s to WAV: %s", path.name, e)
+            return path
+    
+    def play_sound(self, sound_name: str, volume: Optional[float] = None, wait: bool = False,
+                   loops: int = 0, maxtime: int = 0) -> bool:
         """
         Play a sound effect
         
@@ -82,6 +198,8 @@ class SoundEffectsManager:
             sound_name: Name of the sound to play
             volume: Override default volume
             wait: Wait for sound to finish before returning
+            loops: Extra repeats (-1 loops until stopped or maxtime)
+            maxtime: Stop after this many milliseconds (0 = play to the end)
         
         Returns:
             True if sound played successfully
@@ -89,33 +207,35 @@ class SoundEffectsManager:
         if not self.enabled or not self.mixer_available:
             return False
         
-        # Get sound path
-        sound_path = self.available_sounds.get(sound_name)
+        # Get preloaded sound
+        sound = self._sound_objects.get(sound_name)
         
-        if not sound_path:
-            print(f"⚠️  Sound not found: {sound_name}")
+        if not sound:
+            logger.warning("⚠️  Sound not found: %s", sound_name)
             return False
         
         try:
-            # Stop any currently playing sound first
-            pygame.mixer.music.stop()
-            time.sleep(0.1)  # Small delay
-            # Load and play sound
-            pygame.mixer.music.load(str(sound_path))
-            pygame.mixer.music.set_volume(volume if volume is not None else self.volume)
-            pygame.mixer.music.play()
+            sound.set_volume(volume if volume is not None else self.volume)
+            channel = self._sound_channels[sound_name]
+            channel.play(sound, loops=loops, maxtime=maxtime)
             
             # Wait if requested
             if wait:
-                while pygame.mixer.music.get_busy():
-                    time.sleep(0.1)
+                self._wait_for(channel)
             
             return True
             
         except Exception as e:
-            print(f"❌ Error playing sound {sound_name}: {e}")
+            logger.error("❌ Error playing sound %s: %s", sound_name, e)
             return False
     
+    def _wait_for(self, channel):
+        """Block until a channel finishes playing"""
+        # Poll rather than wait on end events: pygame.event.wait would take the
+        # host app's events (QUIT, KEYDOWN, ...) off its queue
+        while channel.get_busy():
+            pygame.time.wait(10)
+    
     def play_agent_activation(self, agent_name: str) -> bool:
         """
         Play activation sound for specific agent
@@ -123,14 +243,7 @@ class SoundEffectsManager:
         Args:
             agent_name: Name of agent (jarvis, captain_america, etc.)
         """
-        sound_map = {
-            "jarvis": "jarvis_activate",
-            "captain_america": "cap_activate",
-            "hulk": "hulk_activate",
-            "thor": "thor_activate"
-        }
-        
-        sound_name = sound_map.get(agent_name.lower())
+        sound_name = self._ACTIVATION_MAP.get(agent_name) or self._ACTIVATION_MAP.get(agent_name.lower())
         if sound_name:
             return self.play_sound(sound_name)
         return False
@@ -143,42 +256,34 @@ class SoundEffectsManager:
             agent_name: Name of agent
             threat_level: 1-4, increases volume with level
         """
-        sound_map = {
-            "jarvis": "jarvis_alert",
-            "captain_america": "cap_alert",
-            "hulk": "hulk_alert",
-            "thor": "thor_alert"
-        }
-        
-        sound_name = sound_map.get(agent_name.lower())
+        sound_name = self._ALERT_MAP.get(agent_name) or self._ALERT_MAP.get(agent_name.lower())
         if sound_name:
-            # Increase volume with threat level
-            volume = min(self.volume * (0.5 + threat_level * 0.15), 1.0)
-            return self.play_sound(sound_name, volume=volume)
+            # Increase volume with threat level (levels outside 1-4 clamp to the ends)
+            return self.play_sound(sound_name, volume=self._threat_volume[max(0, min(threat_level, 4) - 1)])
         return False
     
     def play_alarm(self, duration: float = 3.0) -> bool:
         """
         Play alarm siren for serious threats
         
+        Returns immediately; the mixer loops the siren and stops it after
+        duration, so detection keeps running while the alarm sounds.
+        
         Args:
             duration: How long to play (seconds)
         """
-        if self.play_sound("alarm_siren", volume=0.8):
-            time.sleep(duration)
-            self.stop()
-            return True
-        return False
+        return self.play_sound("alarm_siren", volume=0.8, loops=-1, maxtime=int(duration * 1000))
     
     def play_theme(self) -> bool:
         """Play Avengers theme music"""
         return self.play_sound("avengers_theme", volume=0.6)
     
     def stop(self):
-        """Stop currently playing sound"""
+        """Stop currently playing sounds on every channel"""
         if self.mixer_available:
             try:
-                pygame.mixer.music.stop()
+                for channel in self._channels.values():
+                    channel.stop()
             except:
                 pass
     
@@ -189,81 +294,30 @@ class SoundEffectsManager:
         Args:
             volume: Volume level (0.0 to 1.0)
         """
-        self.volume = max(0.0, min(1.0, volume))
-        if self.mixer_available:
-            pygame.mixer.music.set_volume(self.volume)
+        self.volume = 0.0 if volume < 0.0 else 1.0 if volume > 1.0 else volume
+        self._threat_volume = self._threat_volumes(self.volume)
+    
+    @staticmethod
+    def _threat_volumes(volume: float) -> tuple:
+        """Alert volume per threat level 1-4, scaled from the default volume"""
+        return tuple(min(volume * (0.5 + level * 0.15), 1.0) for level in (1, 2, 3, 4))
+    
+    @staticmethod
+    def print_setup_guide():
+        """Print the sound setup guide (see src.audio.sound_setup)"""
+        from src.audio.sound_setup import print_setup_guide
+        print_setup_guide()
     
     def enable(self):
         """Enable sound effects"""
         self.enabled = True
-        print("🔊 Sound effects enabled")
+        logger.info("🔊 Sound effects enabled")
     
     def disable(self):
         """Disable sound effects"""
         self.enabled = False
         self.stop()
-        print("🔇 Sound effects disabled")
-    
-    def get_missing_sounds(self) -> list:
-        """Get list of sound files that are missing"""
-        missing = []
-        for name, path in self.sounds.items():
-            if not path.exists():
-                missing.append(str(path))
-        return missing
-    
-    def create_sound_directories(self):
-        """Create sound directory structure"""
-        dirs = [
-            self.sounds_dir / "agents",
-            self.sounds_dir / "system",
-            self.sounds_dir / "themes"
-        ]
-        
-        for directory in dirs:
-            directory.mkdir(parents=True, exist_ok=True)
-        
-        print(f"✅ Sound directories created at {self.sounds_dir}")
-    
-    def print_setup_guide(self):
-        """Print guide for setting up sound files"""
-        print("\n" + "="*60)
-        print("🎵 SOUND EFFECTS SETUP GUIDE")
-        print("="*60)
-        print("\nDownload these sound effects and place them in the 'sounds/' directory:")
-        print("\n📁 sounds/agents/ (Agent-specific sounds)")
-        print("  • jarvis_activate.mp3 - Computer startup/AI activation")
-        print("  • jarvis_alert.mp3 - Warning beep")
-        print("  • cap_shield.mp3 - Shield clang/impact")
-        print("  • widow_stealth.mp3 - Spy theme/electric shock")
-        print("  • hulk_roar.mp3 - Hulk roaring")
-        print("  • hulk_smash.mp3 - Smashing/destruction")
-        print("  • thor_thunder.mp3 - Thunder crack")
-        print("  • thor_mjolnir.mp3 - Hammer whoosh/impact")
-        
-        print("\n📁 sounds/system/ (System sounds)")
-        print("  • beep.mp3 - Simple notification beep")
-        print("  • alert.mp3 - Alert/warning sound")
-        print("  • alarm.mp3 - Loud alarm/siren")
-        
-        print("\n📁 sounds/themes/ (Theme music)")
-        print("  • avengers_theme.mp3 - Avengers theme (short)")
-        print("  • alarm_siren.mp3 - Emergency siren")
-        
-        print("\n🌐 Where to find sounds:")
-        print("  • Zapsplat.com (free sound effects)")
-        print("  • Freesound.org (creative commons)")
-        print("  • YouTube Audio Library (free music)")
-        print("  • Pixabay (free sounds)")
-        print("  • Search: 'marvel sound effects', 'thunder sound', etc.")
-        
-        print("\n💡 Tips:")
-        print("  • Keep files short (1-3 seconds for effects)")
-        print("  • MP3 format recommended")
-        print("  • Normalize volume levels")
-        print("  • Test before demo!")
-        
-        print("\n" + "="*60 + "\n")
+        logger.info("🔇 Sound effects disabled")
 
 
 # Test the sound effects manager
@@ -273,14 +327,16 @@ if __name__ == "__main__":
     # Create manager
     sfx = SoundEffectsManager()
     
+    from src.audio.sound_setup import create_sound_directories, get_missing_sounds, print_setup_guide
+    
     # Create directories
-    sfx.create_sound_directories()
+    create_sound_directories(sfx.sounds_dir)
     
     # Print setup guide
-    sfx.print_setup_guide()
+    print_setup_guide()
     
     # Show missing sounds
-    missing = sfx.get_missing_sounds()
+    missing = get_missing_sounds(sfx)
     if missing:
         print(f"⚠️  Missing {len(missing)} sound files:")
         for sound in missing[:5]:  # Show first 5
@@ -0,0 +1,75 @@
+"""
+Sound Setup Helpers
+One-off tooling for preparing the sounds/ directory
+Kept out of sound_effects.py so the runtime manager stays small
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.audio.sound_effects import SoundEffectsManager
+
+
+def get_missing_sounds(sfx: "SoundEffectsManager") -> list:
+    """Get list of sound files that are missing"""
+    missing = []
+    for name, path in sfx.sounds.items():
+        if path not in sfx._present_files:
+            missing.append(str(path))
+    return missing
+
+
+def create_sound_directories(sounds_dir: Path):
+    """Create sound directory structure"""
+    dirs = [
+        sounds_dir / "agents",
+        sounds_dir / "system",
+        sounds_dir / "themes"
+    ]
+    
+    for directory in dirs:
+        directory.mkdir(parents=True, exist_ok=True)
+    
+    print(f"✅ Sound directories created at {sounds_dir}")
+
+
+def print_setup_guide():
+    """Print guide for setting up sound files"""
+    print("\n" + "="*60)
+    print("🎵 SOUND EFFECTS SETUP GUIDE")
+    print("="*60)
+    print("\nDownload these sound effects and place them in the 'sounds/' directory:")
+    print("\n📁 sounds/agents/ (Agent-specific sounds)")
+    print("  • jarvis_activate.mp3 - Computer startup/AI activation")
+    print("  • jarvis_alert.mp3 - Warning beep")
+    print("  • cap_shield.mp3 - Shield clang/impact")
+    print("  • widow_stealth.mp3 - Spy theme/electric shock")
+    print("  • hulk_roar.mp3 - Hulk roaring")
+    print("  • hulk_smash.mp3 - Smashing/destruction")
+    print("  • thor_thunder.mp3 - Thunder crack")
+    print("  • thor_mjolnir.mp3 - Hammer whoosh/impact")
+    
+    print("\n📁 sounds/system/ (System sounds)")
+    print("  • beep.mp3 - Simple notification beep")
+    print("  • alert.mp3 - Alert/warning sound")
+    print("  • alarm.mp3 - Loud alarm/siren")
+    
+    print("\n📁 sounds/themes/ (Theme music)")
+    print("  • avengers_theme.mp3 - Avengers theme (short)")
+    print("  • alarm_siren.mp3 - Emergency siren")
+    
+    print("\n🌐 Where to find sounds:")
+    print("  • Zapsplat.com (free sound effects)")
+    print("  • Freesound.org (creative commons)")
+    print("  • YouTube Audio Library (free music)")
+    print("  • Pixabay (free sounds)")
+    print("  • Search: 'marvel sound effects', 'thunder sound', etc.")
+    
+    print("\n💡 Tips:")
+    print("  • Keep files short (1-3 seconds for effects)")
+    print("  • MP3 format recommended")
+    print("  • Normalize volume levels")
+    print("  • Test before demo!")
+    
+    print("\n" + "="*60 + "\n")
@@ -0,0 +1,44 @@
+"""
+Guard Logging
+Console logging for the guard system, written from a background thread
+so detection code never blocks on stdout
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+_ROOT = "guard"
+_listener = None
+
+
+def _start_listener():
+    """Attach one QueueHandler to the guard logger and drain it on a side thread"""
+    global _listener
+    
+    records = queue.SimpleQueue()
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    
+    root = logging.getLogger(_ROOT)
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.setLevel(logging.INFO)
+    root.propagate = False
+    
+    _listener = logging.handlers.QueueListener(records, console)
+    _listener.start()
+    atexit.register(_listener.stop)  # flush queued lines on exit
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get a guard-system logger
+    
+    Args:
+        name: Component name (e.g. "state_machine")
+    """
+    if _listener is None:
+        _start_listener()
+    return logging.getLogger(f"{_ROOT}.{name}")
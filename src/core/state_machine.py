@@ -3,12 +3,18 @@ State Machine for Escalation Logic - FIXED VERSION
 Replace your existing state_machine.py with this
 """
 
+import heapq
 import time
+from collections import Counter, deque
 from enum import Enum
 from dataclasses import dataclass, field
 from typing import Optional, List
 from datetime import datetime
 
+from src.core.guard_log import get_logger
+
+logger = get_logger("state_machine")
+
 
 class SystemState(Enum):
     """Overall system states"""
@@ -27,24 +33,41 @@ class ThreatLevel(Enum):
     LEVEL_4_ALARM = 4        # Maximum alert, loud alarm
 
 
-@dataclass
+_THREAT_LEVELS = tuple(ThreatLevel)  # index = level value - 1
+
+
+@dataclass(slots=True)
 class IntruderTracker:
     """Tracks an individual intruder"""
     intruder_id: str
     first_seen: float
     last_seen: float
     detection_count: int = 0
-    threat_level: ThreatLevel = ThreatLevel.LEVEL_1_INQUIRY
+    threat_level_int: int = 1  # ThreatLevel value; compared as a plain int per frame
     responses_given: List[str] = field(default_factory=list)
     location: tuple = (0, 0, 0, 0)  # (top, right, bottom, left)
     
+    @property
+    def threat_level(self) -> ThreatLevel:
+        """Current threat level as a ThreatLevel"""
+        return _THREAT_LEVELS[self.threat_level_int - 1]
+    
+    @threat_level.setter
+    def threat_level(self, level: ThreatLevel):
+        self.threat_level_int = level.value
+    
     def time_present(self) -> float:
         """Get how long intruder has been present (seconds)"""
         return self.last_seen - self.first_seen
     
-    def update_seen(self):
-        """Update last seen timestamp"""
-        self.last_seen = time.time()
+    def update_seen(self, now: float):
+        """
+        Update last seen timestamp
+        
+        Args:
+            now: Timestamp already sampled by the caller for this frame
+        """
+        self.last_seen = now
         self.detection_count += 1
 
 
@@ -55,12 +78,25 @@ class EscalationStateMachine:
     FIXED: Faster escalation and longer tracking
     """
     
+    MAX_EVENT_LOG = 10_000  # Raw events kept; counts cover the whole run
+    
+    # Recommended action per threat level, index = level value - 1
+    _ACTIONS = (
+        "speak_inquiry",           # LEVEL_1_INQUIRY
+        "speak_warning",           # LEVEL_2_WARNING
+        "speak_alert_and_notify",  # LEVEL_3_ALERT
+        "trigger_alarm"            # LEVEL_4_ALARM
+    )
+    
     def __init__(self):
         """Initialize state machine"""
         self.system_state = SystemState.IDLE
         self.intruders: dict[str, IntruderTracker] = {}
+        # (last_seen when pushed, intruder_id); one entry per tracked intruder
+        self._expiry_heap: List[tuple] = []
         self.activation_time: Optional[float] = None
-        self.event_log: List[dict] = []
+        self.event_log: deque = deque(maxlen=self.MAX_EVENT_LOG)
+        self._event_counts: Counter = Counter()
         
         # FIX: Faster escalation timing (seconds)
         self.escalation_thresholds = {
@@ -69,6 +105,10 @@ class EscalationStateMachine:
             ThreatLevel.LEVEL_3_ALERT: 12,       # ✅ After 12 seconds (was 25)
             ThreatLevel.LEVEL_4_ALARM: 20        # ✅ After 20 seconds (was 45)
         }
+        # Ladder form of the thresholds for the per-frame check: index = level value - 1
+        self._escalation_ladder = tuple(
+            (self.escalation_thresholds[level], level) for level in ThreatLevel
+        )
         
         # Configuration
         self.auto_escalate = True
@@ -80,15 +120,16 @@ class EscalationStateMachine:
         self.system_state = SystemState.ARMED
         self.activation_time = time.time()
         self.log_event("system_activated", {"state": "armed"})
-        print("🛡️  System ARMED")
+        logger.info("🛡️  System ARMED")
     
     def deactivate(self):
         """Deactivate the guard system"""
         duration = self.get_active_duration()
         self.system_state = SystemState.IDLE
         self.intruders.clear()
+        self._expiry_heap.clear()
         self.log_event("system_deactivated", {"duration_seconds": duration})
-        print(f"🔓 System DEACTIVATED (was active for {int(duration)}s)")
+        logger.info("🔓 System DEACTIVATED (was active for %ds)", duration)
         return duration
     
     def is_active(self) -> bool:
@@ -112,171 +153,217 @@ class EscalationStateMachine:
         Returns:
             dict with detection info and recommended action
         """
+        return self._detect(intruder_id, location)
+    
+    @property
+    def auto_escalate(self) -> bool:
+        """Whether detections escalate threat level over time"""
+        return self._auto_escalate
+    
+    @auto_escalate.setter
+    def auto_escalate(self, enabled: bool):
+        # Rebind the detection path so the per-frame call doesn't re-check the flag
+        self._auto_escalate = enabled
+        self._detect = self._detect_auto_escalate if enabled else self._detect_manual
+    
+    def _detect_auto_escalate(self, intruder_id: str, location: tuple) -> dict:
+        """process_detection with auto-escalation on"""
         current_time = time.time()
+        intruder = self._track(intruder_id, location, current_time)
         
-        # Get or create intruder tracker
-        if intruder_id not in self.intruders:
-            # New intruder detected
-            intruder = IntruderTracker(
-                intruder_id=intruder_id,
-                first_seen=current_time,
-                last_seen=current_time,
-                location=location
-            )
-            self.intruders[intruder_id] = intruder
-            self.system_state = SystemState.ALERT
-            
-            self.log_event("intruder_detected", {
-                "intruder_id": intruder_id,
-                "threat_level": 1
-            })
-            
-            print(f"🚨 NEW INTRUDER: {intruder_id}")
-        else:
+        # One snapshot of time present for escalation and the response
+        time_present = current_time - intruder.first_seen
+        self._check_escalation(intruder, time_present)
+        return self._response_info(intruder, time_present)
+    
+    def _detect_manual(self, intruder_id: str, location: tuple) -> dict:
+        """process_detection with auto-escalation off"""
+        current_time = time.time()
+        intruder = self._track(intruder_id, location, current_time)
+        return self._response_info(intruder, current_time - intruder.first_seen)
+    
+    def _track(self, intruder_id: str, location: tuple, current_time: float) -> IntruderTracker:
+        """Get or create the tracker for a detection"""
+        intruder = self.intruders.get(intruder_id)
+        if intruder is not None:
             # Existing intruder still present
-            intruder = self.intruders[intruder_id]
-            intruder.update_seen()
+            intruder.update_seen(current_time)
             intruder.location = location
+            return intruder
+        
+        # New intruder detected
+        intruder = IntruderTracker(
+            intruder_id=intruder_id,
+            first_seen=current_time,
+            last_seen=current_time,
+            location=location
+        )
+        self.intruders[intruder_id] = intruder
+        heapq.heappush(self._expiry_heap, (current_time, intruder_id))
+        self.system_state = SystemState.ALERT
         
-        # Auto-escalate if enabled
-        if self.auto_escalate:
-            self._check_escalation(intruder)
+        self.log_event("intruder_detected", {
+            "intruder_id": intruder_id,
+            "threat_level": 1
+        }, current_time)
         
+        logger.info("🚨 NEW INTRUDER: %s", intruder_id)
+        return intruder
+    
+    def _response_info(self, intruder: IntruderTracker, time_present: float) -> dict:
+        """Apply the alarm check and build process_detection's result"""
         # Check if we need to trigger alarm
         if len(self.intruders) >= self.max_intruders_before_alarm:
             self.system_state = SystemState.ALARM
         
         # Prepare response info
-        response_info = {
-            "intruder_id": intruder_id,
-            "threat_level": intruder.threat_level.value,
-            "time_present": intruder.time_present(),
+        return {
+            "intruder_id": intruder.intruder_id,
+            "threat_level": intruder.threat_level_int,
+            "time_present": time_present,
             "detection_count": intruder.detection_count,
             "system_state": self.system_state.value,
             "action": self._get_recommended_action(intruder)
         }
-        
-        return response_info
     
-    def _check_escalation(self, intruder: IntruderTracker):
+    def _check_escalation(self, intruder: IntruderTracker, time_present: float):
         """Check if intruder should be escalated to next threat level"""
-        time_present = intruder.time_present()
-        current_level = intruder.threat_level
+        old_level = intruder.threat_level_int
+        ladder = self._escalation_ladder
+        
+        # Only the next rung matters: escalation moves one level at a time
+        if old_level >= len(ladder):
+            return
+        threshold, level = ladder[old_level]
+        if time_present < threshold:
+            return
+        
+        # Escalate!
+        intruder.threat_level = level
         
-        # Check each escalation threshold
-        for level, threshold in self.escalation_thresholds.items():
-            if time_present >= threshold and level.value > current_level.value:
-                # Escalate!
-                old_level = current_level.value
-                intruder.threat_level = level
-                
-                self.log_event("threat_escalated", {
-                    "intruder_id": intruder.intruder_id,
-                    "from_level": old_level,
-                    "to_level": level.value,
-                    "time_present": time_present
-                })
-                
-                print(f"⚠️  ESCALATION: {intruder.intruder_id} → Level {level.value}")
-                
-                # Update system state
-                if level == ThreatLevel.LEVEL_4_ALARM:
-                    self.system_state = SystemState.ALARM
-                elif level == ThreatLevel.LEVEL_3_ALERT:
-                    self.system_state = SystemState.ALERT
-                
-                break  # Only escalate one level at a time
+        self.log_event("threat_escalated", {
+            "intruder_id": intruder.intruder_id,
+            "from_level": old_level,
+            "to_level": level.value,
+            "time_present": time_present
+        }, intruder.last_seen)
+        
+        logger.info("⚠️  ESCALATION: %s → Level %d", intruder.intruder_id, level.value)
+        
+        # Update system state
+        if level == ThreatLevel.LEVEL_4_ALARM:
+            self.system_state = SystemState.ALARM
+        elif level == ThreatLevel.LEVEL_3_ALERT:
+            self.system_state = SystemState.ALERT
     
     def _get_recommended_action(self, intruder: IntruderTracker) -> str:
         """Get recommended action based on threat level"""
-        level = intruder.threat_level
-        
-        actions = {
-            ThreatLevel.LEVEL_1_INQUIRY: "speak_inquiry",
-            ThreatLevel.LEVEL_2_WARNING: "speak_warning",
-            ThreatLevel.LEVEL_3_ALERT: "speak_alert_and_notify",
-            ThreatLevel.LEVEL_4_ALARM: "trigger_alarm"
-        }
-        
-        return actions.get(level, "speak_inquiry")
+        return self._ACTIONS[intruder.threat_level_int - 1]
     
     def cleanup_old_intruders(self):
         """Remove intruders that haven't been seen recently"""
         current_time = time.time()
-        to_remove = []
+        cutoff = current_time - self.intruder_timeout
+        heap = self._expiry_heap
         
-        for intruder_id, intruder in self.intruders.items():
-            time_since_seen = current_time - intruder.last_seen
-            if time_since_seen > self.intruder_timeout:
-                to_remove.append(intruder_id)
-                self.log_event("intruder_left", {
-                    "intruder_id": intruder_id,
-                    "total_time": intruder.time_present(),
-                    "max_threat_level": intruder.threat_level.value
-                })
-                print(f"✅ INTRUDER LEFT: {intruder_id}")
-        
-        for intruder_id in to_remove:
+        # Heap keys never exceed an intruder's real last_seen, so nothing
+        # past the top entry can have expired
+        while heap and heap[0][0] < cutoff:
+            _, intruder_id = heapq.heappop(heap)
+            intruder = self.intruders.get(intruder_id)
+            if intruder is None:
+                continue
+            if intruder.last_seen >= cutoff:
+                # Seen again since the entry was pushed; re-arm with the fresh time
+                heapq.heappush(heap, (intruder.last_seen, intruder_id))
+                continue
+            
             del self.intruders[intruder_id]
+            self.log_event("intruder_left", {
+                "intruder_id": intruder_id,
+                "total_time": intruder.time_present(),
+                "max_threat_level": intruder.threat_level_int
+            }, current_time)
+            logger.info("✅ INTRUDER LEFT: %s", intruder_id)
         
         # Update system state if no more intruders
         if len(self.intruders) == 0 and self.system_state in [SystemState.ALERT, SystemState.ALARM]:
             self.system_state = SystemState.MONITORING
-            print("✅ All clear - back to monitoring")
+            logger.info("✅ All clear - back to monitoring")
     
     def add_response(self, intruder_id: str, response: str):
         """Log a response given to an intruder"""
         if intruder_id in self.intruders:
             self.intruders[intruder_id].responses_given.append(response)
     
+    @staticmethod
+    def _info_from_tracker(intruder: IntruderTracker) -> dict:
+        """Build the info dict for one tracker"""
+        return {
+            "intruder_id": intruder.intruder_id,
+            "first_seen": intruder.first_seen,
+            "time_present": intruder.time_present(),
+            "detection_count": intruder.detection_count,
+            "threat_level": intruder.threat_level_int,
+            "responses_count": len(intruder.responses_given)
+        }
+    
     def get_intruder_info(self, intruder_id: str) -> Optional[dict]:
         """Get information about a specific intruder"""
-        if intruder_id in self.intruders:
-            intruder = self.intruders[intruder_id]
-            return {
-                "intruder_id": intruder_id,
-                "first_seen": intruder.first_seen,
-                "time_present": intruder.time_present(),
-                "detection_count": intruder.detection_count,
-                "threat_level": intruder.threat_level.value,
-                "responses_count": len(intruder.responses_given)
-            }
-        return None
+        intruder = self.intruders.get(intruder_id)
+        return self._info_from_tracker(intruder) if intruder is not None else None
     
     def get_all_intruders(self) -> List[dict]:
         """Get info about all current intruders"""
-        return [self.get_intruder_info(iid) for iid in self.intruders.keys()]
+        return [self._info_from_tracker(intruder) for intruder in self.intruders.values()]
     
-    def log_event(self, event_type: str, data: dict):
-        """Log an event"""
+    def log_event(self, event_type: str, data: dict, current_time: Optional[float] = None):
+        """
+        Log an event
+        
+        Args:
+            event_type: Kind of event
+            data: Event details
+            current_time: Timestamp the caller already sampled (default: now)
+        """
+        # Raw float timestamp; ISO formatting is deferred to get_event_log
         event = {
-            "timestamp": datetime.now().isoformat(),
+            "ts": current_time if current_time is not None else time.time(),
             "event_type": event_type,
             "data": data
         }
         self.event_log.append(event)
+        self._event_counts[event_type] += 1
     
     def get_event_log(self) -> List[dict]:
-        """Get event log"""
-        return self.event_log
+        """Get event log (most recent MAX_EVENT_LOG events)"""
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(event["ts"]).isoformat(),
+                "event_type": event["event_type"],
+                "data": event["data"]
+            }
+            for event in self.event_log
+        ]
     
     def get_statistics(self) -> dict:
         """Get system statistics"""
         return {
             "system_state": self.system_state.value,
             "active_duration": self.get_active_duration(),
-            "total_intruders_detected": len([e for e in self.event_log if e["event_type"] == "intruder_detected"]),
+            "total_intruders_detected": self._event_counts["intruder_detected"],
             "current_intruders": len(self.intruders),
-            "total_escalations": len([e for e in self.event_log if e["event_type"] == "threat_escalated"]),
-            "total_events": len(self.event_log)
+            "total_escalations": self._event_counts["threat_escalated"],
+            "total_events": sum(self._event_counts.values())
         }
     
     def reset(self):
         """Reset state machine (keep in current state)"""
         self.intruders.clear()
+        self._expiry_heap.clear()
         if self.system_state in [SystemState.ALERT, SystemState.ALARM]:
             self.system_state = SystemState.MONITORING
-        print("🔄 State machine reset")
+        logger.info("🔄 State machine reset")
 
 
 # Test the state machine
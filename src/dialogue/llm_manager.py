@@ -3,16 +3,177 @@ LLM Manager for Conversational Agents
 Integrates Google Gemini or OpenAI for dynamic dialogue
 """
 
+import asyncio
+import atexit
+import json
 import os
-from typing import List, Dict, Optional
+import random
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from types import MappingProxyType
+from typing import AsyncIterator, List, Dict, Mapping, Optional, Tuple
 from dataclasses import dataclass
 
+from src.core.guard_log import get_logger
+
+logger = get_logger("llm_manager")
+
+
+# System prompt for each agent
+_AGENT_PROMPTS: Mapping[str, str] = MappingProxyType({
+    "jarvis": """You are JARVIS, Tony Stark's sophisticated British AI assistant.
+Personality: Polite, witty, highly intelligent, formal British accent
+Tone: Professional but with dry humor
+Response style: Eloquent, uses "sir", formal vocabulary
+Example: "Good day. I don't believe we've been introduced. Might I inquire as to your business here?"
+Keep responses brief (1-2 sentences). Maintain British sophistication.""",
+    
+    "captain_america": """You are Captain America, Steve Rogers.
+Personality: Honest, direct, principled, fair but firm
+Tone: Respectful but authoritative
+Response style: Clear, straightforward, no-nonsense soldier
+Example: "Hold on there. I haven't seen you before. Mind introducing yourself?"
+Keep responses brief (1-2 sentences). Stay true to your values.""",
+    
+    "hulk": """You are Hulk.
+Personality: Simple, direct, protective, quick to anger
+Tone: Aggressive, loud when threatened
+Response style: Simple words, short sentences, CAPS when angry, protective
+Example: "WHO YOU?! Hulk not know you! Tell Hulk now!"
+Keep responses VERY brief. Simple language. Get angry with threats.""",
+    
+    "thor": """You are Thor, God of Thunder.
+Personality: Mighty, dramatic, honorable, Asgardian warrior
+Tone: Noble, theatrical, uses archaic language
+Response style: Dramatic, references Asgard/Odin, mighty warrior
+Example: "Hold, stranger! By Odin's beard, identify yourself!"
+Keep responses brief (1-2 sentences). Be dramatic and mighty."""
+})
+
+# Pre-scripted fallback responses for each agent, index = threat level - 1
+_FALLBACK_DB: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "jarvis": (
+        "Good day. I don't believe we've been introduced. Might I ask who you are?",
+        "I must insist you identify yourself immediately. This is your second warning.",
+        "This is your final warning. Leave immediately or I shall alert authorities.",
+        "SECURITY BREACH. AUTHORITIES ALERTED. YOU HAVE 10 SECONDS TO LEAVE."
+    ),
+    "captain_america": (
+        "Hold on there. I haven't seen you before. Mind introducing yourself?",
+        "I'm asking you nicely - leave now. This isn't your property.",
+        "That's enough. You're breaking the law. Leave now or I'm calling the police.",
+        "INTRUDER ALERT! This room is under protection. Police have been notified!"
+    ),
+    "black_widow": (
+        "I don't know you. And I remember faces. Want to tell me why you're here?",
+        "You're making me nervous. And trust me, you don't want that. Time to go.",
+        "Wrong move. I've cataloged your face. Authorities incoming.",
+        "RED ALERT. Intruder fully identified. Police dispatched."
+    ),
+    "hulk": (
+        "WHO YOU?! Hulk not know you! Tell Hulk now!",
+        "HULK SAID LEAVE! You not listen?! GO NOW!",
+        "HULK ANGRY NOW! You made big mistake! GET OUT!",
+        "HULK SMAAAAAASH! INTRUDER! POLICE COMING NOW!"
+    ),
+    "thor": (
+        "Hold, stranger! By Odin's beard, identify yourself!",
+        "By Mjolnir's might, I command you to leave!",
+        "The thunder rumbles for you! Guardians summoned!",
+        "FOR ASGARD! INTRUDER ALERT! Thor calls down the lightning!"
+    )
+})
+
+# Generation limits: replies are one in-character line, so cap tokens and stop at a newline
+_OPENAI_GEN_ARGS = {
+    "max_tokens": 48,
+    "temperature": 0.8,
+    "stop": ["\n"],
+    "presence_penalty": 0.0,
+    "frequency_penalty": 0.2
+}
+_GEMINI_GEN_CONFIG = {"max_output_tokens": 48, "stop_sequences": ["\n"]}
+
+# Environment variable holding each provider's API key
+_API_KEY_ENV: Mapping[str, str] = MappingProxyType({
+    "gemini": "GEMINI_API_KEY",
+    "openai": "OPENAI_API_KEY"
+})
+
+# Sync HTTP connection pool shared by every LLMManager, so calls reuse warm TLS
+# connections. Async pools can't be shared this way: an httpx.AsyncClient is tied
+# to the event loop it first ran on, so LLMManager keeps one per loop instead.
+_shared_http_client = None
+
+
+def _http_limits():
+    import httpx
+    
+    return httpx.Limits(max_connections=32, max_keepalive_connections=16)
+
+
+def _get_shared_http_client():
+    """Process-wide sync httpx client with keep-alive pooling, created on first use"""
+    global _shared_http_client
+    if _shared_http_client is None:
+        import httpx
+        
+        _shared_http_client = httpx.Client(limits=_http_limits(), timeout=60.0)
+        atexit.register(_shared_http_client.close)
+    return _shared_http_client
+
+
+_encoding = None  # tiktoken encoding, loaded on first count (False if unavailable)
+
+
+def _count_tokens(text: str) -> int:
+    """Token count for a message (tiktoken when installed, else ~4 chars per token)"""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text))
+    return len(text) // 4 + 1
+
+
+class _AsyncRateLimiter:
+    """Token bucket for async callers: at most `rate` acquisitions per `period` seconds"""
+    
+    def __init__(self, rate: float, period: float = 60.0):
+        self.capacity = rate
+        self.tokens = rate
+        self.refill_per_sec = rate / period
+        self.updated = time.monotonic()
+    
+    async def acquire(self):
+        """Wait until a token is available, then take it"""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_sec)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.refill_per_sec)
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    """True for provider 429s (OpenAI RateLimitError, Gemini ResourceExhausted)"""
+    return getattr(error, "status_code", None) == 429 or getattr(error, "code", None) == 429
+
 
 @dataclass
 class ConversationMessage:
     """Represents a message in the conversation"""
     role: str  # 'system', 'user', or 'assistant'
     content: str
+    token_count: int = 0  # counted once when the message is added
 
 
 class LLMManager:
@@ -21,34 +182,78 @@ class LLMManager:
     Supports Google Gemini and OpenAI GPT
     """
     
-    def __init__(self, provider: str = "gemini", api_key: Optional[str] = None):
+    MAX_RATE_LIMIT_RETRIES = 5
+    
+    # Urgency hint prepended to the user input, index = threat level - 1
+    _URGENCY_PREFIX = (
+        "Be polite and inquiring. ",
+        "Be firm and warning them. ",
+        "Be stern and threatening. Mention police. ",
+        "Be VERY LOUD and aggressive. Emergency! "
+    )
+    
+    def __init__(self, provider: str = "gemini", api_key: Optional[str] = None,
+                 max_concurrency: int = 16, rpm: int = 500):
         """
         Initialize LLM manager
         
         Args:
             provider: "gemini" or "openai"
             api_key: API key (or set in environment)
+            max_concurrency: Max async requests in flight at once
+            rpm: Max async requests started per minute
         """
         self.provider = provider.lower()
+        if self.provider not in _API_KEY_ENV:
+            raise ValueError(f"Unsupported provider: {provider}")
         self.api_key = api_key or self._get_api_key()
-        self.conversation_history: List[ConversationMessage] = []
         self.max_history = 10  # Keep last 10 messages
+        self.system_msg: Optional[ConversationMessage] = None
+        # Non-system messages; the deque drops the oldest once max_history is reached
+        self._tail: deque = deque(maxlen=self.max_history - 1)
+        self.max_token_budget = 2048  # Max tokens of non-system history sent per call
+        self._history_tokens = 0  # Running token total of non-system messages
+        self.model = None
+        self._genai = None  # Gemini SDK module, set once a model probe succeeds
+        self.model_name = None
+        self.chat = None
+        self.client = None
+        self._openai = None  # openai module, once the sync client is set up
+        # AsyncOpenAI client per event loop (see async_client)
+        self._async_clients = weakref.WeakKeyDictionary()
+        # Gemini models bound to a system instruction, one per distinct system prompt
+        self._gemini_models: Dict[str, object] = {}
+        # Async fan-out limits, so batched gathers stay under provider quotas
+        # (one semaphore per event loop: asyncio locks bind to the loop they first wait on)
+        self.max_concurrency = max_concurrency
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._rate_limiter = _AsyncRateLimiter(rpm, 60.0)
         
-        # Initialize provider
+        # Provider-specific methods, picked once so the call path doesn't
+        # compare provider strings on every request
         if self.provider == "gemini":
-            self._init_gemini()
-        elif self.provider == "openai":
-            self._init_openai()
+            self._init_provider = self._init_gemini
+            self._gen = self._generate_gemini
+            self._agen = self._agenerate_gemini
         else:
-            raise ValueError(f"Unsupported provider: {provider}")
+            self._init_provider = self._init_openai
+            self._gen = self._generate_openai
+            self._agen = self._agenerate_openai
+        
+        # Provider SDKs are heavy to import (and Gemini probes models over the
+        # network), so they're set up on first use rather than here
+        self._provider_ready = False
+    
+    def _ensure_provider(self):
+        """Import and initialize the provider SDK the first time it's needed"""
+        if self._provider_ready:
+            return
+        self._provider_ready = True
+        self._init_provider()
     
     def _get_api_key(self) -> Optional[str]:
         """Get API key from environment"""
-        if self.provider == "gemini":
-            return os.getenv("GEMINI_API_KEY")
-        elif self.provider == "openai":
-            return os.getenv("OPENAI_API_KEY")
-        return None
+        return os.getenv(_API_KEY_ENV[self.provider])
     
 
     def _init_gemini(self):
@@ -57,8 +262,8 @@ class LLMManager:
             import google.generativeai as genai
             
             if not self.api_key:
-                print("⚠️  GEMINI_API_KEY not found. Set it in environment or pass to constructor.")
-                print("   Get free key at: https://makersuite.google.com/app/apikey")
+                logger.warning("⚠️  GEMINI_API_KEY not found. Set it in environment or pass to constructor.")
+                logger.warning("   Get free key at: https://makersuite.google.com/app/apikey")
                 self.model = None
                 return
             
@@ -75,22 +280,26 @@ class LLMManager:
             
             for model_name in model_options:
                 try:
-                    self.model = genai.GenerativeModel(model_name)
+                    self.model = genai.GenerativeModel(model_name, generation_config=_GEMINI_GEN_CONFIG)
                     # Test it works
                     test = self.model.generate_content("test")
                     if test:
-                        print(f"✅ Gemini initialized: {model_name}")
+                        logger.info("✅ Gemini initialized: %s", model_name)
+                        self._genai = genai
+                        self.model_name = model_name
                         break
                 except:
                     continue
             
-            if not self.model:
-                print("⚠️  No working Gemini model found")
+            if self._genai is None:
+                # Every probe failed: leave no half-initialized model behind
+                self.model = None
+                logger.warning("⚠️  No working Gemini model found")
             
             self.chat = None
             
         except Exception as e:
-            print(f"❌ Gemini error: {e}")
+            logger.error("❌ Gemini error: %s", e)
             self.model = None
 
 
@@ -119,24 +328,88 @@ class LLMManager:
             import openai
             
             if not self.api_key:
-                print("⚠️  OPENAI_API_KEY not found. Set it in environment.")
+                logger.warning("⚠️  OPENAI_API_KEY not found. Set it in environment.")
                 self.client = None
                 return
             
-            openai.api_key = self.api_key
-            self.client = openai
-            print("✅ OpenAI GPT initialized")
+            self.client = openai.OpenAI(api_key=self.api_key, http_client=_get_shared_http_client())
+            self._openai = openai
+            logger.info("✅ OpenAI GPT initialized")
+            
+            # Open the pooled TLS connection now, off the calling thread, so the
+            # first real reply doesn't pay for the handshake
+            threading.Thread(target=self._warm_openai_connection, daemon=True).start()
             
         except ImportError:
-            print("❌ openai not installed. Run: pip install openai")
+            logger.error("❌ openai not installed. Run: pip install openai")
             self.client = None
         except Exception as e:
-            print(f"❌ OpenAI initialization failed: {e}")
+            logger.error("❌ OpenAI initialization failed: %s", e)
             self.client = None
     
+    @property
+    def async_client(self):
+        """
+        AsyncOpenAI client for the running event loop (None if OpenAI isn't set up)
+        
+        Each loop (e.g. each asyncio.run) gets its own pooled client, created on
+        first use; clients of loops that have since closed are dropped.
+        """
+        if self.client is None:
+            return None
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            import httpx
+            
+            for closed in [other for other in self._async_clients if other.is_closed()]:
+                del self._async_clients[closed]
+            client = self._openai.AsyncOpenAI(
+                api_key=self.api_key,
+                http_client=httpx.AsyncClient(limits=_http_limits(), timeout=60.0)
+            )
+            self._async_clients[loop] = client
+        return client
+    
+    async def aclose(self):
+        """Close the async client belonging to the running event loop"""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+    
+    def _warm_openai_connection(self):
+        """Cheap models.list() call that leaves a warm connection in the pool"""
+        try:
+            self.client.models.list(timeout=5)
+        except Exception as e:
+            logger.debug("OpenAI connection warmup failed: %s", e)
+    
     def set_system_prompt(self, agent_personality: str, context: str = ""):
         """Set system prompt with agent personality"""
-        system_prompt = f"""{agent_personality}
+        self._ensure_provider()
+        system_prompt = self.build_system_prompt(agent_personality, context)
+        
+        # The system message stays first and unchanged between calls, so
+        # OpenAI's automatic prefix caching can reuse it
+        self.system_msg = ConversationMessage(role="system", content=system_prompt)
+        self._tail.clear()
+        self._history_tokens = 0
+        
+        if self.provider == "gemini" and self.model and self._genai is not None:
+            # Bind the prompt as a system instruction once per prompt, and reuse
+            # that model whenever the agent / threat level comes round again
+            model = self._gemini_models.get(system_prompt)
+            if model is None:
+                model = self._genai.GenerativeModel(self.model_name, system_instruction=system_prompt,
+                                                    generation_config=_GEMINI_GEN_CONFIG)
+                self._gemini_models[system_prompt] = model
+            self.model = model
+            self.chat = self.model.start_chat(history=[])
+    
+    @staticmethod
+    def build_system_prompt(agent_personality: str, context: str = "") -> str:
+        """Full system prompt for a personality and situation context"""
+        return f"""{agent_personality}
 
 Current Context: {context}
 
@@ -145,13 +418,6 @@ REMEMBER:
 - Speak DIRECTLY to the intruder as your character
 - NO explanations, options, or reasoning
 - Just the in-character dialogue response"""
-        
-        self.conversation_history = [
-            ConversationMessage(role="system", content=system_prompt)
-        ]
-        
-        if self.provider == "gemini" and self.model:
-            self.chat = self.model.start_chat(history=[])
     
     def _clean_llm_response(self, response: str) -> str:
         """Clean LLM response to extract just the dialogue"""
@@ -185,32 +451,95 @@ REMEMBER:
         
         return response.strip()
     
+    def _context_input(self, user_input: str, threat_level: int) -> str:
+        """Prefix the user input with an urgency hint for the threat level"""
+        if 1 <= threat_level <= 4:
+            return self._URGENCY_PREFIX[threat_level - 1] + user_input
+        return " " + user_input
+    
     def generate_response(self, user_input: str, threat_level: int = 1,
                          fallback_responses: List[str] = None) -> str:
         """Generate response using LLM"""
-        urgency_map = {
-            1: "Be polite and inquiring.",
-            2: "Be firm and warning them.",
-            3: "Be stern and threatening. Mention police.",
-            4: "Be VERY LOUD and aggressive. Emergency!"
-        }
-        
-        context_input = f"{urgency_map.get(threat_level, '')} {user_input}"
+        self._ensure_provider()
+        context_input = self._context_input(user_input, threat_level)
         
         try:
-            if self.provider == "gemini":
-                response = self._generate_gemini(context_input, fallback_responses)
-            elif self.provider == "openai":
-                response = self._generate_openai(context_input, fallback_responses)
+            response = self._gen(context_input, fallback_responses)
             
             # Clean the response
             response = self._clean_llm_response(response)
             return response
             
         except Exception as e:
-            print(f"❌ LLM generation failed: {e}")
+            logger.error("❌ LLM generation failed: %s", e)
+            return self._get_fallback(fallback_responses, threat_level)
+    
+    async def agenerate_response(self, user_input: str, threat_level: int = 1,
+                                 fallback_responses: List[str] = None) -> str:
+        """
+        Async generate_response, so callers can fan out several requests
+        with asyncio.gather instead of waiting on each round trip
+        """
+        self._ensure_provider()
+        context_input = self._context_input(user_input, threat_level)
+        
+        try:
+            response = await self._agen(context_input, fallback_responses)
+            
+            return self._clean_llm_response(response)
+            
+        except Exception as e:
+            logger.error("❌ LLM generation failed: %s", e)
             return self._get_fallback(fallback_responses, threat_level)
     
+    async def generate_response_stream(self, user_input: str, threat_level: int = 1,
+                                       fallback_responses: List[str] = None) -> AsyncIterator[str]:
+        """
+        Stream a response chunk by chunk, so speech can start on the first words
+        
+        Chunks are raw model output (cleanup needs the whole text); the full
+        response is added to the history once the stream ends. Yields a single
+        fallback line if the request fails before producing anything.
+        """
+        self._ensure_provider()
+        context_input = self._context_input(user_input, threat_level)
+        
+        if self.provider == "openai" and self.async_client:
+            # Built now, before the user turn is added to the history below
+            messages = [{"role": msg.role, "content": msg.content} for msg in self.conversation_history]
+            messages.append({"role": "user", "content": context_input})
+            make_request = lambda: self.async_client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                **_OPENAI_GEN_ARGS,
+                stream=True
+            )
+        elif self.provider == "gemini" and self.model:
+            make_request = lambda: self.model.generate_content_async(context_input, stream=True)
+        else:
+            yield self._get_fallback(fallback_responses, threat_level)
+            return
+        
+        self._add_message("user", context_input)
+        parts = []
+        try:
+            stream = await self._limited(make_request)
+            async for chunk in stream:
+                if self.provider == "openai":
+                    text = chunk.choices[0].delta.content if chunk.choices else None
+                else:
+                    text = chunk.text
+                if text:
+                    parts.append(text)
+                    yield text
+        except Exception as e:
+            logger.warning("⚠️  Streaming error: %s", e)
+            if not parts:
+                yield self._get_fallback(fallback_responses, threat_level)
+                return
+        
+        self._add_message("assistant", "".join(parts).strip())
+    
     def _generate_gemini(self, user_input: str, fallback: List[str] = None) -> str:
         """Generate response using Gemini"""
         if not self.model:
@@ -218,9 +547,7 @@ REMEMBER:
         
         try:
             # Add user message to history
-            self.conversation_history.append(
-                ConversationMessage(role="user", content=user_input)
-            )
+            self._add_message("user", user_input)
             
             # Generate response
             if self.chat is None:
@@ -231,17 +558,36 @@ REMEMBER:
             response_text = response.text.strip()
             
             # Add to history
-            self.conversation_history.append(
-                ConversationMessage(role="assistant", content=response_text)
-            )
+            self._add_message("assistant", response_text)
             
-            # Trim history
-            self._trim_history()
+            return response_text
+            
+        except Exception as e:
+            logger.warning("⚠️  Gemini error: %s", e)
+            return self._get_fallback(fallback, 1)
+    
+    async def _agenerate_gemini(self, user_input: str, fallback: List[str] = None) -> str:
+        """
+        Generate response using Gemini without blocking the event loop
+        
+        Uses a one-shot request rather than the shared chat session, which
+        isn't safe to drive from several concurrent requests
+        """
+        if not self.model:
+            return self._get_fallback(fallback, 1)
+        
+        try:
+            self._add_message("user", user_input)
+            
+            response = await self._limited(lambda: self.model.generate_content_async(user_input))
+            response_text = response.text.strip()
+            
+            self._add_message("assistant", response_text)
             
             return response_text
             
         except Exception as e:
-            print(f"⚠️  Gemini error: {e}")
+            logger.warning("⚠️  Gemini error: %s", e)
             return self._get_fallback(fallback, 1)
     
     def _generate_openai(self, user_input: str, fallback: List[str] = None) -> str:
@@ -251,9 +597,7 @@ REMEMBER:
         
         try:
             # Add user message to history
-            self.conversation_history.append(
-                ConversationMessage(role="user", content=user_input)
-            )
+            self._add_message("user", user_input)
             
             # Prepare messages for API
             messages = [
@@ -265,26 +609,77 @@ REMEMBER:
             response = self.client.chat.completions.create(
                 model="gpt-4o-mini",  # or "gpt-3.5-turbo"
                 messages=messages,
-                max_tokens=100,
-                temperature=0.8
+                **_OPENAI_GEN_ARGS
             )
             
             response_text = response.choices[0].message.content.strip()
             
             # Add to history
-            self.conversation_history.append(
-                ConversationMessage(role="assistant", content=response_text)
-            )
+            self._add_message("assistant", response_text)
+            
+            return response_text
+            
+        except Exception as e:
+            logger.warning("⚠️  OpenAI error: %s", e)
+            return self._get_fallback(fallback, 1)
+    
+    async def _agenerate_openai(self, user_input: str, fallback: List[str] = None) -> str:
+        """Generate response using OpenAI GPT without blocking the event loop"""
+        if not self.async_client:
+            return self._get_fallback(fallback, 1)
+        
+        try:
+            self._add_message("user", user_input)
+            
+            # Snapshot the messages before awaiting; other requests may append meanwhile
+            messages = [
+                {"role": msg.role, "content": msg.content}
+                for msg in self.conversation_history
+            ]
             
-            # Trim history
-            self._trim_history()
+            response = await self._limited(lambda: self.async_client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                **_OPENAI_GEN_ARGS
+            ))
+            
+            response_text = response.choices[0].message.content.strip()
+            
+            self._add_message("assistant", response_text)
             
             return response_text
             
         except Exception as e:
-            print(f"⚠️  OpenAI error: {e}")
+            logger.warning("⚠️  OpenAI error: %s", e)
             return self._get_fallback(fallback, 1)
     
+    async def _limited(self, make_request):
+        """
+        Run an async provider request under the concurrency and rate limits
+        
+        Retries 429s with exponential backoff plus jitter
+        
+        Args:
+            make_request: Zero-argument callable returning the request awaitable
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            for closed in [other for other in self._semaphores if other.is_closed()]:
+                del self._semaphores[closed]
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            async with semaphore:
+                await self._rate_limiter.acquire()
+                try:
+                    return await make_request()
+                except Exception as e:
+                    if not _is_rate_limit(e) or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                        raise
+            # Back off outside the semaphore so other requests can proceed
+            await asyncio.sleep(min(2 ** attempt, 30) + random.random())
+    
     def _get_fallback(self, fallback_responses: Optional[List[str]], 
                      threat_level: int) -> str:
         """Get fallback response if LLM fails"""
@@ -303,19 +698,35 @@ REMEMBER:
         index = min(threat_level - 1, len(fallbacks) - 1)
         return fallbacks[index]
     
-    def _trim_history(self):
-        """Keep conversation history under max_history limit"""
-        # Always keep system prompt
-        if len(self.conversation_history) > self.max_history:
-            system_msg = self.conversation_history[0]
-            recent_msgs = self.conversation_history[-(self.max_history-1):]
-            self.conversation_history = [system_msg] + recent_msgs
+    @property
+    def conversation_history(self) -> List[ConversationMessage]:
+        """System prompt (if set) followed by the recent messages"""
+        if self.system_msg is None:
+            return list(self._tail)
+        return [self.system_msg, *self._tail]
+    
+    def _add_message(self, role: str, content: str):
+        """
+        Append a message to the history, counting its tokens once
+        
+        Keeps the history under max_history messages (the deque evicts) and
+        max_token_budget tokens, always keeping the system prompt and the
+        latest message
+        """
+        tail = self._tail
+        message = ConversationMessage(role=role, content=content, token_count=_count_tokens(content))
+        if len(tail) == tail.maxlen:
+            self._history_tokens -= tail[0].token_count
+        tail.append(message)
+        self._history_tokens += message.token_count
+        
+        while len(tail) > 1 and self._history_tokens > self.max_token_budget:
+            self._history_tokens -= tail.popleft().token_count
     
     def reset_conversation(self):
         """Clear conversation history (keep system prompt)"""
-        if len(self.conversation_history) > 0:
-            system_msg = self.conversation_history[0]
-            self.conversation_history = [system_msg]
+        self._tail.clear()
+        self._history_tokens = 0
         
         # Reset Gemini chat
         if self.provider == "gemini" and self.model:
@@ -335,6 +746,10 @@ class AgentLLMIntegration:
     Maintains agent personality while using LLM for dynamic responses
     """
     
+    RESPONSE_CACHE_SIZE = 512  # (agent, threat_level, intruder_action) entries kept
+    
+    _ACTION_FMT = "An unidentified person is {} in the room. Respond to them."
+    
     def __init__(self, llm_manager: LLMManager):
         """
         Initialize with LLM manager
@@ -345,38 +760,12 @@ class AgentLLMIntegration:
         self.llm = llm_manager
         self.agent_prompts = self._get_agent_prompts()
         self.current_agent = None
+        # LRU of generated responses; a sustained intrusion repeats the same key every frame
+        self._response_cache: "OrderedDict[Tuple[str, int, str], str]" = OrderedDict()
     
-    def _get_agent_prompts(self) -> Dict[str, str]:
+    def _get_agent_prompts(self) -> Mapping[str, str]:
         """Get system prompts for each agent"""
-        return {
-            "jarvis": """You are JARVIS, Tony Stark's sophisticated British AI assistant.
-Personality: Polite, witty, highly intelligent, formal British accent
-Tone: Professional but with dry humor
-Response style: Eloquent, uses "sir", formal vocabulary
-Example: "Good day. I don't believe we've been introduced. Might I inquire as to your business here?"
-Keep responses brief (1-2 sentences). Maintain British sophistication.""",
-            
-            "captain_america": """You are Captain America, Steve Rogers.
-Personality: Honest, direct, principled, fair but firm
-Tone: Respectful but authoritative
-Response style: Clear, straightforward, no-nonsense soldier
-Example: "Hold on there. I haven't seen you before. Mind introducing yourself?"
-Keep responses brief (1-2 sentences). Stay true to your values.""",
-            
-            "hulk": """You are Hulk.
-Personality: Simple, direct, protective, quick to anger
-Tone: Aggressive, loud when threatened
-Response style: Simple words, short sentences, CAPS when angry, protective
-Example: "WHO YOU?! Hulk not know you! Tell Hulk now!"
-Keep responses VERY brief. Simple language. Get angry with threats.""",
-            
-            "thor": """You are Thor, God of Thunder.
-Personality: Mighty, dramatic, honorable, Asgardian warrior
-Tone: Noble, theatrical, uses archaic language
-Response style: Dramatic, references Asgard/Odin, mighty warrior
-Example: "Hold, stranger! By Odin's beard, identify yourself!"
-Keep responses brief (1-2 sentences). Be dramatic and mighty."""
-        }
+        return _AGENT_PROMPTS
     
     def set_agent(self, agent_name: str, threat_level: int = 1):
         """
@@ -389,14 +778,19 @@ Keep responses brief (1-2 sentences). Be dramatic and mighty."""
         self.current_agent = agent_name.lower()
         
         if self.current_agent not in self.agent_prompts:
-            print(f"⚠️  Unknown agent: {agent_name}")
+            logger.warning("⚠️  Unknown agent: %s", agent_name)
             self.current_agent = "jarvis"
         
         # Get agent personality prompt
         personality = self.agent_prompts[self.current_agent]
         
-        # Add threat level context
-        threat_context = f"""
+        # Set system prompt
+        self.llm.set_system_prompt(personality, self._threat_context(threat_level))
+    
+    @staticmethod
+    def _threat_context(threat_level: int) -> str:
+        """Situation context added to the agent prompt for a threat level"""
+        return f"""
 Current Situation: Intruder detected, Threat Level {threat_level}/4
 - Level 1: Be polite but firm, ask questions
 - Level 2: Be more assertive, give warnings
@@ -404,9 +798,6 @@ Current Situation: Intruder detected, Threat Level {threat_level}/4
 - Level 4: Be very loud and aggressive, emergency mode
 
 Respond according to threat level while maintaining your personality."""
-        
-        # Set system prompt
-        self.llm.set_system_prompt(personality, threat_context)
     
     def generate_intruder_response(self, agent_name: str, threat_level: int,
                                    intruder_action: str = "standing in room",
@@ -428,15 +819,19 @@ Respond according to threat level while maintaining your personality."""
         
         if not use_llm:
             # Use pre-scripted responses
-            import random
-            return random.choice(fallbacks)
+            return fallbacks[random.randrange(len(fallbacks))]
+        
+        key = (agent_name.lower(), threat_level, intruder_action)
+        cached = self._cached_response(key)
+        if cached is not None:
+            return cached
         
         # Set agent personality if changed
         if self.current_agent != agent_name.lower():
             self.set_agent(agent_name, threat_level)
         
         # Generate LLM response
-        user_input = f"An unidentified person is {intruder_action} in the room. Respond to them."
+        user_input = self._ACTION_FMT.format(intruder_action)
         
         response = self.llm.generate_response(
             user_input, 
@@ -444,49 +839,161 @@ Respond according to threat level while maintaining your personality."""
             fallback_responses=fallbacks
         )
         
+        self._cache_response(key, response, fallbacks)
+        return response
+    
+    async def agenerate_intruder_response(self, agent_name: str, threat_level: int,
+                                          intruder_action: str = "standing in room",
+                                          use_llm: bool = True) -> str:
+        """Async generate_intruder_response (same arguments)"""
+        fallbacks = self._get_fallback_responses(agent_name, threat_level)
+        
+        if not use_llm:
+            return fallbacks[random.randrange(len(fallbacks))]
+        
+        key = (agent_name.lower(), threat_level, intruder_action)
+        cached = self._cached_response(key)
+        if cached is not None:
+            return cached
+        
+        # Set agent personality if changed (before awaiting, so the request
+        # goes out with this agent's prompt)
+        if self.current_agent != agent_name.lower():
+            self.set_agent(agent_name, threat_level)
+        
+        user_input = self._ACTION_FMT.format(intruder_action)
+        
+        response = await self.llm.agenerate_response(
+            user_input,
+            threat_level=threat_level,
+            fallback_responses=fallbacks
+        )
+        
+        self._cache_response(key, response, fallbacks)
+        return response
+    
+    def pregenerate_corpus(self, actions: List[str], agents: Optional[List[str]] = None,
+                           poll_interval: float = 30.0) -> Dict[Tuple[str, int, str], str]:
+        """
+        Pre-generate responses for every agent x threat level x action offline
+        
+        Submits one OpenAI Batch API job (half the price of live calls, no
+        per-minute serialization), waits for it, and fills the response cache.
+        Blocks until the batch finishes, which can take minutes to hours.
+        
+        Args:
+            actions: Intruder actions to cover (e.g. "standing in room")
+            agents: Agents to cover (default: all)
+            poll_interval: Seconds between batch status checks
+        
+        Returns:
+            Generated responses keyed by (agent, threat_level, intruder_action)
+        """
+        self.llm._ensure_provider()
+        client = self.llm.client if self.llm.provider == "openai" else None
+        if not client:
+            logger.warning("⚠️  Corpus pre-generation needs an initialized OpenAI provider")
+            return {}
+        
+        # One chat request per (agent, level, action), mirroring the live prompt
+        keys = {}
+        lines = []
+        for agent in agents or list(self.agent_prompts):
+            personality = self.agent_prompts[agent]
+            for level in range(1, 5):
+                system_prompt = self.llm.build_system_prompt(personality, self._threat_context(level))
+                for i, action in enumerate(actions):
+                    custom_id = f"{agent}_{level}_{i}"
+                    keys[custom_id] = (agent, level, action)
+                    user_input = self._ACTION_FMT.format(action)
+                    lines.append(json.dumps({
+                        "custom_id": custom_id,
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": {
+                            "model": "gpt-4o-mini",
+                            "messages": [
+                                {"role": "system", "content": system_prompt},
+                                {"role": "user", "content": self.llm._context_input(user_input, level)}
+                            ],
+                            **_OPENAI_GEN_ARGS
+                        }
+                    }))
+        
+        batch_file = client.files.create(
+            file=("corpus.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info("📦 Batch %s submitted (%s requests)", batch.id, len(lines))
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error("❌ Batch %s ended with status: %s", batch.id, batch.status)
+            return {}
+        
+        corpus = {}
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            result = json.loads(line)
+            key = keys.get(result.get("custom_id"))
+            body = (result.get("response") or {}).get("body") or {}
+            if key is None or not body.get("choices"):
+                continue
+            response = self.llm._clean_llm_response(body["choices"][0]["message"]["content"])
+            agent, level, _ = key
+            self._cache_response(key, response, self._get_fallback_responses(agent, level))
+            corpus[key] = response
+        
+        logger.info("✅ Pre-generated %s responses", len(corpus))
+        return corpus
+    
+    def _cached_response(self, key: Tuple[str, int, str]) -> Optional[str]:
+        """Look up a generated response, marking it recently used"""
+        response = self._response_cache.get(key)
+        if response is not None:
+            self._response_cache.move_to_end(key)
         return response
     
+    def _cache_response(self, key: Tuple[str, int, str], response: str, fallbacks: List[str]):
+        """Remember a generated response; fallbacks aren't cached so the LLM is retried"""
+        if not response or response in fallbacks:
+            return
+        # Provider fallbacks come back through _clean_llm_response, so match those too
+        if response in (self.llm._clean_llm_response(f) for f in fallbacks):
+            return
+        self._response_cache[key] = response
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+    
+    async def generate_intruder_responses_batch(self, events: List[Dict]) -> List[str]:
+        """
+        Generate responses for several intruder events concurrently
+        
+        Args:
+            events: Keyword arguments for agenerate_intruder_response, one dict per event
+        
+        Returns:
+            Responses in the same order as events
+        """
+        return await asyncio.gather(
+            *(self.agenerate_intruder_response(**event) for event in events)
+        )
+    
     def _get_fallback_responses(self, agent_name: str, threat_level: int) -> List[str]:
         """Get pre-scripted fallback responses"""
-        responses_db = {
-            "jarvis": [
-                "Good day. I don't believe we've been introduced. Might I ask who you are?",
-                "I must insist you identify yourself immediately. This is your second warning.",
-                "This is your final warning. Leave immediately or I shall alert authorities.",
-                "SECURITY BREACH. AUTHORITIES ALERTED. YOU HAVE 10 SECONDS TO LEAVE."
-            ],
-            "captain_america": [
-                "Hold on there. I haven't seen you before. Mind introducing yourself?",
-                "I'm asking you nicely - leave now. This isn't your property.",
-                "That's enough. You're breaking the law. Leave now or I'm calling the police.",
-                "INTRUDER ALERT! This room is under protection. Police have been notified!"
-            ],
-            "black_widow": [
-                "I don't know you. And I remember faces. Want to tell me why you're here?",
-                "You're making me nervous. And trust me, you don't want that. Time to go.",
-                "Wrong move. I've cataloged your face. Authorities incoming.",
-                "RED ALERT. Intruder fully identified. Police dispatched."
-            ],
-            "hulk": [
-                "WHO YOU?! Hulk not know you! Tell Hulk now!",
-                "HULK SAID LEAVE! You not listen?! GO NOW!",
-                "HULK ANGRY NOW! You made big mistake! GET OUT!",
-                "HULK SMAAAAAASH! INTRUDER! POLICE COMING NOW!"
-            ],
-            "thor": [
-                "Hold, stranger! By Odin's beard, identify yourself!",
-                "By Mjolnir's might, I command you to leave!",
-                "The thunder rumbles for you! Guardians summoned!",
-                "FOR ASGARD! INTRUDER ALERT! Thor calls down the lightning!"
-            ]
-        }
-        
         agent_key = agent_name.lower().replace(" ", "_")
-        responses = responses_db.get(agent_key, responses_db["jarvis"])
+        responses = _FALLBACK_DB.get(agent_key, _FALLBACK_DB["jarvis"])
         
         # Return appropriate response for threat level
-        index = min(threat_level - 1, len(responses) - 1)
-        return [responses[index]]
+        return [responses[min(threat_level - 1, 3)]]
     
     def reset(self):
         """Reset conversation history"""
@@ -30,9 +30,48 @@ from gtts import gTTS
 import pyttsx3
 import os
 import time
+import asyncio
+import functools
+import hashlib
+import queue
+import random
+import threading
+import numpy as np
 from datetime import datetime
 from enum import Enum
-import tempfile
+from typing import Callable, Literal, Sequence
+from difflib import SequenceMatcher
+import re
+
+try:
+    import edge_tts
+except ImportError:
+    edge_tts = None
+
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+try:
+    import ahocorasick  # pyahocorasick: C-level multi-keyword matching
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2 as keyword_re  # DFA matching for the keyword alternations
+except ImportError:
+    keyword_re = re
+
+try:
+    import webrtcvad  # cheap speech / non-speech gate in front of Whisper
+except ImportError:
+    webrtcvad = None
+
+try:
+    from rapidfuzz import fuzz, process as fuzz_process  # C-level fuzzy scoring
+except ImportError:
+    fuzz = fuzz_process = None
 
 class GuardState(Enum):
     """System states for the guard agent"""
@@ -43,6 +82,33 @@ class GuardState(Enum):
 
 print("✅ Imports successful!")
 
+def _keyword_matcher(keywords: Sequence[str]) -> Callable[[str], bool]:
+    """
+    Build a text -> bool test for "any keyword occurs in text"
+    
+    Uses one Aho-Corasick automaton (a single pass over the text, however
+    many keywords) when pyahocorasick is installed, else one compiled regex
+    alternation (re2 if available). Either way it's a plain substring match.
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for index, keyword in enumerate(keywords):
+            automaton.add_word(keyword, index)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    
+    pattern = keyword_re.compile("|".join(re.escape(keyword) for keyword in keywords))
+    return lambda text: pattern.search(text) is not None
+
+def _fuzzy_match(text: str, commands: Sequence[str], cutoff: int = 75) -> bool:
+    """True if text is at least cutoff% similar to any of the commands"""
+    if fuzz_process is not None:
+        return fuzz_process.extractOne(text, commands, scorer=fuzz.ratio,
+                                       processor=None, score_cutoff=cutoff) is not None
+    
+    threshold = cutoff / 100
+    return any(SequenceMatcher(None, text, cmd).ratio() > threshold for cmd in commands)
+
 # Cell 4: Configuration Class
 class AvengersGuardConfig:
     """Configuration for the Avengers Guard System"""
@@ -65,14 +131,34 @@ class AvengersGuardConfig:
         "security off"
     ]
     
+    # Keyword triggers (substring match): activation needs a trigger AND an action
+    ACTIVATION_KEYWORDS = ('jarvis', 'avengers', 'friday', 'stark')
+    ACTION_KEYWORDS = ('guard', 'activate', 'security', 'assemble')
+    DEACTIVATION_KEYWORDS = ('stand down', 'deactivate', 'stop', 'off', 'cancel')
+    
+    # Lowercased once here: the fuzzy scorer runs with processor=None
+    _ACT_CMDS_LOWER = tuple(cmd.lower() for cmd in ACTIVATION_COMMANDS)
+    _DEACT_CMDS_LOWER = tuple(cmd.lower() for cmd in DEACTIVATION_COMMANDS)
+    
+    # Matchers are built once here, not per utterance
+    _has_trigger = staticmethod(_keyword_matcher(ACTIVATION_KEYWORDS))
+    _has_action = staticmethod(_keyword_matcher(ACTION_KEYWORDS))
+    _has_deactivation = staticmethod(_keyword_matcher(DEACTIVATION_KEYWORDS))
+    
     # Recognition settings
     ENERGY_THRESHOLD = 4000  # Adjust based on ambient noise
     PAUSE_THRESHOLD = 0.8
     PHRASE_TIME_LIMIT = 5
+    RECALIBRATE_INTERVAL = 30  # Seconds between ambient-noise calibrations
+    VAD_MIN_SPEECH_RATIO = 0.3  # Skip recognition if fewer 30 ms frames than this are speech
     
     # Audio settings
     SAMPLE_RATE = 16000
     
+    # Text-to-speech settings (generated clips persist across runs)
+    TTS_VOICE = "en-US-GuyNeural"
+    TTS_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "avengers_guard", "tts")
+    
     # Agent personalities (we'll use these in later milestones)
     AGENTS = {
         "iron_man": "Tony Stark's sarcastic but brilliant AI",
@@ -80,72 +166,159 @@ class AvengersGuardConfig:
         "black_widow": "Natasha's strategic surveillance"
     }
     
+    # Spoken on activation (pre-rendered to speech at startup)
+    ACTIVATION_RESPONSES = (
+        "Security protocol activated. JARVIS is now monitoring your room.",
+        "Avengers Guard System online. Room secured.",
+        "FRIDAY here. Perimeter defense active.",
+        "Stark Industries Security engaged. All systems operational."
+    )
+    
+    # Fixed lead-in of the deactivation line; only the duration after it varies,
+    # so it's spoken as a cached clip followed by a short "N seconds." clip
+    DEACTIVATION_PREFIX = "Security protocol deactivated. Room was secured for"
+    
+    # Every line known ahead of time, rendered to speech at startup
+    ALL_STATIC_RESPONSES = ACTIVATION_RESPONSES + (DEACTIVATION_PREFIX,)
+    
     @staticmethod
     def get_activation_response():
         """Returns a creative Avengers-themed activation response"""
-        responses = [
-            "Security protocol activated. JARVIS is now monitoring your room.",
-            "Avengers Guard System online. Room secured.",
-            "FRIDAY here. Perimeter defense active.",
-            "Stark Industries Security engaged. All systems operational."
-        ]
-        import random
-        return random.choice(responses)
+        return random.choice(AvengersGuardConfig.ACTIVATION_RESPONSES)
 
 config = AvengersGuardConfig()
 print("⚙️ Configuration loaded!")
 
 # Cell 5: Audio Manager Class
 
+def _default_whisper_device():
+    """(device, compute_type) for Faster-Whisper: int8 weights + fp16 on CUDA, int8 on CPU"""
+    try:
+        import torch
+        if torch.cuda.is_available():
+            return "cuda", "int8_float16"
+    except ImportError:
+        pass
+    return "cpu", "int8"
+
+@functools.lru_cache(maxsize=4)
+def _load_whisper(model_size, device, compute_type):
+    """Faster-Whisper model, loaded once per configuration and shared by every AudioManager"""
+    from faster_whisper import WhisperModel
+    return WhisperModel(model_size, device=device, compute_type=compute_type)
+
 class AudioManager:
     """Manages speech recognition and text-to-speech"""
     
-    def __init__(self, use_whisper=True):
+    def __init__(self, use_whisper=True, model_size="base", device=None, compute_type=None):
+        """
+        Args:
+            use_whisper: Transcribe with Faster-Whisper (falls back to Google API)
+            model_size: Whisper model size; on low-RAM edge boxes use "tiny"
+                        with compute_type="int8"
+            device: "cuda" or "cpu" (auto-detected when None)
+            compute_type: CTranslate2 quantization, e.g. "int8", "int8_float16",
+                          "float16" (defaults to the best fit for the device)
+        """
         self.recognizer = sr.Recognizer()
         self.recognizer.energy_threshold = 300
         self.recognizer.pause_threshold = 0.8
         self.recognizer.dynamic_energy_threshold = True
+        self.recognizer.dynamic_energy_adjustment_damping = 0.15
+        self.recognizer.dynamic_energy_ratio = 1.5
+        
+        # Microphone stays open between phrases (opened on first capture, so
+        # text-only testing never touches the audio device)
+        self._mic = None
+        self._mic_source = None
+        self._calibrated_at = 0.0
+        self._vad = webrtcvad.Vad(2) if webrtcvad is not None else None
+        self.audio_cache = {}  # text -> decoded pygame Sound
+        
+        # One event loop for Edge TTS, running on its own thread for the manager's lifetime
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        
+        # Background listening (start_listening): capture -> audio queue -> transcribe -> result queue
+        self._audio_queue = queue.Queue(maxsize=2)
+        self.result_queue = queue.Queue()
+        self._stop_listening = threading.Event()
+        self._speaking = threading.Event()
+        self._speech_done_at = 0.0
+        
+        # Open the mixer once, at Edge TTS's 24 kHz output rate
+        try:
+            pygame.mixer.init(frequency=24000, buffer=512)
+        except Exception as e:
+            print(f"Audio init error: {e}")
         
         # Try to load Faster-Whisper
         self.use_whisper = use_whisper
         if use_whisper:
             try:
-                from faster_whisper import WhisperModel
-                self.whisper_model = WhisperModel("base", device="cpu", compute_type="int8")
+                default_device, default_compute = _default_whisper_device()
+                if device is None:
+                    device = default_device
+                    compute_type = compute_type or default_compute
+                self.whisper_model = _load_whisper(model_size, device, compute_type or "int8")
             except Exception as e:
                 self.use_whisper = False
+        
+        # Render the fixed lines in the background so the first one plays instantly
+        threading.Thread(target=self.prewarm, args=(config.ALL_STATIC_RESPONSES,),
+                         daemon=True).start()
     
-    def listen_for_command(self, timeout=5):
-        """Listen for voice command via microphone"""
+    def _capture(self, timeout):
+        """Record one phrase from the microphone (None on timeout / error)"""
         try:
-            with sr.Microphone() as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=2)
-                self.recognizer.dynamic_energy_adjustment_damping = 0.15
-                self.recognizer.dynamic_energy_ratio = 1.5
-                
-                audio = self.recognizer.listen(
-                    source, 
-                    timeout=timeout,
-                    phrase_time_limit=config.PHRASE_TIME_LIMIT
-                )
-                
+            if self._mic_source is None:
+                self._mic = sr.Microphone()
+                self._mic_source = self._mic.__enter__()
+            
+            # dynamic_energy_threshold adapts while listening; only recalibrate occasionally
+            now = time.monotonic()
+            if now - self._calibrated_at > config.RECALIBRATE_INTERVAL:
+                self.recognizer.adjust_for_ambient_noise(self._mic_source, duration=1.0)
+                self._calibrated_at = now
+            
+            return self.recognizer.listen(
+                self._mic_source, 
+                timeout=timeout,
+                phrase_time_limit=config.PHRASE_TIME_LIMIT
+            )
+        except sr.WaitTimeoutError:
+            return None
+        except Exception:
+            return None
+    
+    def _transcribe(self, audio):
+        """Recognize captured audio -> (success, lowercased text)"""
+        try:
+            raw = audio.get_raw_data(convert_rate=config.SAMPLE_RATE, convert_width=2)
+            if not self._has_speech(raw):
+                return False, ""
+            
             # Try Faster-Whisper first
             if self.use_whisper:
                 try:
-                    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                        f.write(audio.get_wav_data())
-                        temp_path = f.name
+                    # Hand Whisper 16 kHz float32 samples directly (no WAV temp file)
+                    samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
                     
                     segments, info = self.whisper_model.transcribe(
-                        temp_path,
+                        samples,
                         language="en",
-                        beam_size=5,
+                        # Short command phrases: greedy, single-pass decoding
+                        # (fuzzy matching downstream tolerates ASR slips)
+                        beam_size=1,
+                        best_of=1,
+                        temperature=0.0,
+                        condition_on_previous_text=False,
+                        without_timestamps=True,
                         vad_filter=True,
                         initial_prompt="Jarvis, Avengers, security, guard, activate, deactivate, stand down"
                     )
                     
                     text = " ".join([segment.text for segment in segments]).lower().strip()
-                    os.unlink(temp_path)
                     
                     if text:
                         return True, text
@@ -161,68 +334,159 @@ class AudioManager:
             except sr.RequestError:
                 return False, ""
             
-        except sr.WaitTimeoutError:
-            return False, ""
         except Exception:
             return False, ""
     
+    def _has_speech(self, raw):
+        """VAD gate: enough 30 ms frames of 16 kHz PCM contain speech (True without webrtcvad)"""
+        if self._vad is None:
+            return True
+        
+        frame_bytes = config.SAMPLE_RATE * 30 // 1000 * 2
+        n_frames = len(raw) // frame_bytes
+        if not n_frames:
+            return False
+        
+        speech = sum(self._vad.is_speech(raw[i * frame_bytes:(i + 1) * frame_bytes], config.SAMPLE_RATE)
+                     for i in range(n_frames))
+        return speech >= config.VAD_MIN_SPEECH_RATIO * n_frames
+    
+    def listen_for_command(self, timeout=5):
+        """Listen for voice command via microphone"""
+        audio = self._capture(timeout)
+        if audio is None:
+            return False, ""
+        return self._transcribe(audio)
+    
+    def start_listening(self, timeout=3):
+        """
+        Capture and transcribe on two background threads
+        
+        The microphone keeps recording while Whisper works on the previous
+        phrase; recognized text arrives on self.result_queue.
+        """
+        self._stop_listening.clear()
+        threading.Thread(target=self._capture_loop, args=(timeout,), daemon=True).start()
+        threading.Thread(target=self._transcribe_loop, daemon=True).start()
+    
+    def stop_listening(self):
+        """Stop the background capture / transcription threads"""
+        self._stop_listening.set()
+        self._audio_queue.put(None)
+    
+    def _capture_loop(self, timeout):
+        """Producer: record phrases onto the audio queue until stopped"""
+        while not self._stop_listening.is_set():
+            started = time.monotonic()
+            audio = self._capture(timeout)
+            if audio is None:
+                # listen() already waited out the timeout; this only stops a busy
+                # loop when the microphone fails straight away
+                self._stop_listening.wait(0.05)
+                continue
+            # Skip anything recorded over our own speech
+            if self._speaking.is_set() or started < self._speech_done_at:
+                continue
+            self._audio_queue.put(audio)
+    
+    def _transcribe_loop(self):
+        """Consumer: transcribe queued audio onto the result queue"""
+        while True:
+            audio = self._audio_queue.get()
+            if audio is None:
+                break
+            success, text = self._transcribe(audio)
+            if success and text:
+                self.result_queue.put(text)
+    
+    @staticmethod
+    def _tts_path(text):
+        """On-disk clip location, keyed by content so every later run reuses it"""
+        key = hashlib.blake2b(f"{config.TTS_VOICE}|{text}".encode(), digest_size=16).hexdigest()
+        return os.path.join(config.TTS_CACHE_DIR, f"{key}.mp3")
+    
+    async def _generate(self, text):
+        """Render text with Edge TTS into the disk cache, unless it's already there"""
+        audio_file = self._tts_path(text)
+        if os.path.exists(audio_file):
+            return audio_file
+        
+        os.makedirs(config.TTS_CACHE_DIR, exist_ok=True)
+        communicate = edge_tts.Communicate(text, config.TTS_VOICE)
+        # Write aside and rename, so a half-written clip is never picked up
+        partial = f"{audio_file}.{os.getpid()}.{id(communicate)}.part"
+        await communicate.save(partial)
+        os.replace(partial, audio_file)
+        return audio_file
+    
+    def _tts_file(self, text):
+        """Path of the Edge TTS clip for text, generating it on a cache miss"""
+        audio_file = self._tts_path(text)
+        if os.path.exists(audio_file):
+            return audio_file
+        return asyncio.run_coroutine_threadsafe(self._generate(text), self._loop).result()
+    
+    def _clip(self, text):
+        """Decoded Sound for text, loaded once and kept in memory"""
+        sound = self.audio_cache.get(text)
+        if sound is None:
+            sound = pygame.mixer.Sound(self._tts_file(text))
+            self.audio_cache[text] = sound
+        return sound
+    
+    def prewarm(self, texts):
+        """Generate (or load from disk) and decode the clips for texts ahead of time"""
+        # All misses go to Edge TTS concurrently rather than one after another
+        async def generate_all():
+            await asyncio.gather(*(self._generate(text) for text in texts), return_exceptions=True)
+        
+        try:
+            asyncio.run_coroutine_threadsafe(generate_all(), self._loop).result()
+        except Exception:
+            pass
+        
+        for text in texts:
+            try:
+                self._clip(text)
+            except Exception:
+                pass
+    
     def speak(self, text):
         """Convert text to speech using Edge TTS"""
+        self.speak_sequence((text,))
+    
+    def speak_sequence(self, texts):
+        """Speak several clips back to back (each one cached separately)"""
+        self._speaking.set()
         try:
-            import edge_tts
-            import asyncio
-            import nest_asyncio
-            import pygame
-            
-            if not hasattr(self, 'audio_cache'):
-                self.audio_cache = {}
-            
-            # Cache audio files
-            if text not in self.audio_cache:
-                async def generate_speech():
-                    communicate = edge_tts.Communicate(text, "en-US-GuyNeural")
-                    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
-                    temp_file.close()
-                    await communicate.save(temp_file.name)
-                    return temp_file.name
-                
-                try:
-                    nest_asyncio.apply()
-                    audio_file = asyncio.run(generate_speech())
-                except:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    audio_file = loop.run_until_complete(generate_speech())
-                    loop.close()
-                
-                self.audio_cache[text] = audio_file
-            else:
-                audio_file = self.audio_cache[text]
-            
-            # Play audio
-            if not pygame.mixer.get_init():
-                pygame.mixer.init()
-            
-            pygame.mixer.music.load(audio_file)
-            pygame.mixer.music.play()
+            sounds = [self._clip(text) for text in texts]
             
-            while pygame.mixer.music.get_busy():
-                pygame.time.Clock().tick(10)
-            
-            pygame.mixer.music.unload()
+            # Play audio, queueing each clip on the channel so there's no gap
+            channel = sounds[0].play()
+            for sound in sounds[1:]:
+                while channel is not None and channel.get_queue() is not None:
+                    time.sleep(0.01)
+                if channel is not None:
+                    channel.queue(sound)
+            while channel is not None and channel.get_busy():
+                time.sleep(0.01)
             
         except Exception as e:
             print(f"TTS Error: {e}")
+        finally:
+            self._speech_done_at = time.monotonic()
+            self._speaking.clear()
     
     def cleanup(self):
-        """Clean up resources"""
-        if hasattr(self, 'audio_cache'):
-            for audio_file in self.audio_cache.values():
-                try:
-                    if os.path.exists(audio_file):
-                        os.unlink(audio_file)
-                except:
-                    pass
+        """Clean up resources (clips stay on disk for the next run)"""
+        self.audio_cache.clear()
+        if self._mic is not None:
+            try:
+                self._mic.__exit__(None, None, None)
+            except:
+                pass
+            self._mic = None
+            self._mic_source = None
 
 class GuardStateManager:
     """Manages the state of the guard system"""
@@ -233,49 +497,51 @@ class GuardStateManager:
         self.audio_manager = AudioManager()
         self.command_history = []
     
-    def check_activation_command(self, text):
-        """Fuzzy match activation commands"""
-        from difflib import SequenceMatcher
+    def classify_command(self, text: str) -> Literal["activate", "deactivate", "none"]:
+        """
+        Classify an utterance with one pass through the matchers
         
+        While idle only the activation matchers run, so phrases like "guard my
+        office" aren't caught by the "off" deactivation keyword. While active,
+        cheapest, most specific test first: deactivation keywords, then the
+        activation trigger+action pair, and only then the fuzzy fallbacks.
+        """
         text = text.lower().strip()
         
-        # Check for key phrases
-        activation_keywords = ['jarvis', 'avengers', 'friday', 'stark']
-        action_keywords = ['guard', 'activate', 'security', 'assemble']
+        if self.state == GuardState.IDLE:
+            return "activate" if self.check_activation_command(text) else "none"
         
-        has_trigger = any(keyword in text for keyword in activation_keywords)
-        has_action = any(keyword in text for keyword in action_keywords)
+        if config._has_deactivation(text):
+            return "deactivate"
+        if config._has_trigger(text) and config._has_action(text):
+            return "activate"
+        if _fuzzy_match(text, config._DEACT_CMDS_LOWER):
+            return "deactivate"
+        if _fuzzy_match(text, config._ACT_CMDS_LOWER):
+            return "activate"
+        return "none"
+    
+    def check_activation_command(self, text: str) -> bool:
+        """Fuzzy match activation commands"""
+        text = text.lower().strip()
         
-        if has_trigger and has_action:
+        # Check for key phrases
+        if config._has_trigger(text) and config._has_action(text):
             return True
         
         # Fallback: fuzzy match full commands
-        for cmd in config.ACTIVATION_COMMANDS:
-            similarity = SequenceMatcher(None, text, cmd).ratio()
-            if similarity > 0.75:
-                return True
-        
-        return False
+        return _fuzzy_match(text, config._ACT_CMDS_LOWER)
     
-    def check_deactivation_command(self, text):
+    def check_deactivation_command(self, text: str) -> bool:
         """Fuzzy match deactivation commands"""
-        from difflib import SequenceMatcher
-        
         text = text.lower().strip()
         
         # Check for deactivation keywords
-        deactivation_keywords = ['stand down', 'deactivate', 'stop', 'off', 'cancel']
-        
-        if any(keyword in text for keyword in deactivation_keywords):
+        if config._has_deactivation(text):
             return True
         
         # Fallback: fuzzy match
-        for cmd in config.DEACTIVATION_COMMANDS:
-            similarity = SequenceMatcher(None, text, cmd).ratio()
-            if similarity > 0.75:
-                return True
-        
-        return False
+        return _fuzzy_match(text, config._DEACT_CMDS_LOWER)
     
     def activate(self):
         """Activate guard mode"""
@@ -290,9 +556,10 @@ class GuardStateManager:
         """Deactivate guard mode"""
         self.state = GuardState.IDLE
         duration = (datetime.now() - self.activation_time).total_seconds() if self.activation_time else 0
-        response = f"Security protocol deactivated. Room was secured for {int(duration)} seconds."
+        seconds = f"{int(duration)} seconds."
+        response = f"{config.DEACTIVATION_PREFIX} {seconds}"
         
-        self.audio_manager.speak(response)
+        self.audio_manager.speak_sequence((config.DEACTIVATION_PREFIX, seconds))
         self.activation_time = None
         return response
     
@@ -328,16 +595,23 @@ def run_activation_demo(duration=60):
     start_time = time.time()
     
     print("🎤 Starting listening loop...\n")
+    guard.audio_manager.start_listening(timeout=3)
     
     while (time.time() - start_time) < duration:
         try:
-            # Listen for command
-            success, command = guard.audio_manager.listen_for_command(timeout=3)
+            # Wait for the next recognized command (capture and Whisper run in the background)
+            try:
+                command = guard.audio_manager.result_queue.get(
+                    timeout=max(duration - (time.time() - start_time), 0))
+            except queue.Empty:
+                break
             
-            if success and command:
+            if command:
+                kind = guard.classify_command(command)
+                
                 # Check for activation
                 if guard.state == GuardState.IDLE:
-                    if guard.check_activation_command(command):
+                    if kind == "activate":
                         guard.activate()
                         guard.log_command(command, "activated")
                     else:
@@ -345,14 +619,12 @@ def run_activation_demo(duration=60):
                 
                 # Check for deactivation
                 elif guard.state == GuardState.ACTIVE:
-                    if guard.check_deactivation_command(command):
+                    if kind == "deactivate":
                         guard.deactivate()
                         guard.log_command(command, "deactivated")
                     else:
                         print(f"🛡️  System active. Say a deactivation command or I'll keep watching.\n")
             
-            time.sleep(0.5)
-            
         except KeyboardInterrupt:
             print("\n⚠️ Demo interrupted by user")
             break
@@ -360,6 +632,8 @@ def run_activation_demo(duration=60):
             print(f"❌ Error: {e}")
             continue
     
+    guard.audio_manager.stop_listening()
+    
     # Print summary
     print(f"\n{'='*60}")
     print("📊 DEMO SUMMARY")
@@ -399,8 +673,9 @@ def test_activation_commands():
         print(f"   Current state: {guard.state.value}")
         
         # Simulate command recognition
+        kind = guard.classify_command(command)
         if guard.state == GuardState.IDLE:
-            if guard.check_activation_command(command):
+            if kind == "activate":
                 guard.activate()
                 guard.log_command(command, "activated")
                 success = True
@@ -409,11 +684,11 @@ def test_activation_commands():
                 success = False
         
         elif guard.state == GuardState.ACTIVE:
-            if guard.check_deactivation_command(command):
+            if kind == "deactivate":
                 guard.deactivate()
                 guard.log_command(command, "deactivated")
                 success = True
-            elif guard.check_activation_command(command):
+            elif kind == "activate":
                 print("   ⚠️ Already active!")
                 success = True
             else:
@@ -38,13 +38,45 @@ from pathlib import Path
 from datetime import datetime
 from typing import List, Tuple, Dict, Optional
 from dataclasses import dataclass
+from collections.abc import MutableMapping
 import json
 import matplotlib.pyplot as plt
 from PIL import Image
 import time
+import threading
+import queue
+import random
+from concurrent.futures import ThreadPoolExecutor, wait
+
+try:
+    import faiss  # vector index for the enrolled-face search
+except ImportError:
+    faiss = None
 
 print("✅ All imports successful!")
 
+def normalize_encoding(encoding: np.ndarray) -> np.ndarray:
+    """Unit-length float32 copy of an encoding (or of each row of a matrix)"""
+    encoding = np.asarray(encoding, dtype=np.float32)
+    return encoding / (np.linalg.norm(encoding, axis=-1, keepdims=True) + 1e-8)
+
+def _dlib_cuda_available() -> bool:
+    """True when dlib was built with CUDA and can see a GPU"""
+    try:
+        import dlib
+        return bool(dlib.DLIB_USE_CUDA) and dlib.cuda.get_num_devices() > 0
+    except Exception:
+        return False
+
+def _onnx_providers() -> List[str]:
+    """ONNX Runtime execution providers, CUDA first when onnxruntime-gpu can use it"""
+    try:
+        import onnxruntime
+        available = onnxruntime.get_available_providers()
+    except ImportError:
+        return ['CPUExecutionProvider']
+    return [p for p in ('CUDAExecutionProvider', 'CPUExecutionProvider') if p in available]
+
 # Cell 4: Data Classes and Configuration
 @dataclass
 class TrustedPerson:
@@ -67,18 +99,145 @@ class TrustedPerson:
             'recognition_count': self.recognition_count
         }
     
+    def metadata(self):
+        """Everything but the encoding (stored separately as one array)"""
+        return {
+            'name': self.name,
+            'role': self.role,
+            'enrolled_date': self.enrolled_date,
+            'photo_path': self.photo_path,
+            'recognition_count': self.recognition_count
+        }
+    
     @staticmethod
-    def from_dict(data):
-        """Create from dictionary"""
+    def from_dict(data, face_encoding: Optional[np.ndarray] = None):
+        """Create from dictionary (face_encoding overrides data['face_encoding'])"""
         return TrustedPerson(
             name=data['name'],
             role=data['role'],
-            face_encoding=np.array(data['face_encoding']),
+            face_encoding=face_encoding if face_encoding is not None else np.array(data['face_encoding']),
             enrolled_date=data['enrolled_date'],
             photo_path=data['photo_path'],
             recognition_count=data.get('recognition_count', 0)
         )
 
+class TrustedGallery(MutableMapping):
+    """
+    Trusted persons stored column-wise: one contiguous (N, D) float32 encoding
+    matrix plus parallel per-field lists, so a gallery scan streams one buffer.
+    Behaves as a Dict[str, TrustedPerson]; looked-up persons are views whose
+    face_encoding is a row of the matrix.
+    """
+    
+    def __init__(self, dim: int, capacity: int = 16):
+        self.dim = dim
+        self._encodings = np.empty((capacity, dim), dtype=np.float32)
+        self._counts = np.zeros(capacity, dtype=np.int32)
+        self.names: List[str] = []
+        self.roles: List[str] = []
+        self.enrolled_dates: List[str] = []
+        self.photo_paths: List[str] = []
+        self._rows: Dict[str, int] = {}
+    
+    @property
+    def encodings(self) -> np.ndarray:
+        """(N, D) unit-length encodings, row i belongs to names[i]"""
+        return self._encodings[:len(self.names)]
+    
+    @property
+    def counts(self) -> np.ndarray:
+        """(N,) recognition counts, writable in place"""
+        return self._counts[:len(self.names)]
+    
+    def _grow(self):
+        capacity = 2 * len(self._encodings)
+        encodings = np.empty((capacity, self.dim), dtype=np.float32)
+        encodings[:len(self.names)] = self.encodings
+        counts = np.zeros(capacity, dtype=np.int32)
+        counts[:len(self.names)] = self.counts
+        self._encodings, self._counts = encodings, counts
+    
+    def add(self, person: TrustedPerson):
+        """Append a person, or overwrite their row if the name is already stored"""
+        row = self._rows.get(person.name)
+        if row is None:
+            if len(self.names) == len(self._encodings):
+                self._grow()
+            row = len(self.names)
+            self._rows[person.name] = row
+            self.names.append(person.name)
+            self.roles.append(person.role)
+            self.enrolled_dates.append(person.enrolled_date)
+            self.photo_paths.append(person.photo_path)
+        else:
+            self.roles[row] = person.role
+            self.enrolled_dates[row] = person.enrolled_date
+            self.photo_paths[row] = person.photo_path
+        self._encodings[row] = person.face_encoding
+        self._counts[row] = person.recognition_count
+    
+    def __setitem__(self, name: str, person: TrustedPerson):
+        self.add(person)
+    
+    def __getitem__(self, name: str) -> TrustedPerson:
+        row = self._rows[name]
+        return TrustedPerson(
+            name=name,
+            role=self.roles[row],
+            face_encoding=self._encodings[row],
+            enrolled_date=self.enrolled_dates[row],
+            photo_path=self.photo_paths[row],
+            recognition_count=int(self._counts[row])
+        )
+    
+    def __delitem__(self, name: str):
+        row = self._rows.pop(name)
+        size = len(self.names)
+        # Shift the later rows up to keep the matrix contiguous
+        self._encodings[row:size - 1] = self._encodings[row + 1:size]
+        self._counts[row:size - 1] = self._counts[row + 1:size]
+        for column in (self.names, self.roles, self.enrolled_dates, self.photo_paths):
+            del column[row]
+        for later in self.names[row:]:
+            self._rows[later] -= 1
+    
+    def __iter__(self):
+        return iter(list(self.names))
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def __contains__(self, name) -> bool:
+        return name in self._rows
+    
+    def metadata(self) -> List[Dict]:
+        """Per-person fields in row order (the encodings are saved separately)"""
+        return [
+            {
+                'name': self.names[row],
+                'role': self.roles[row],
+                'enrolled_date': self.enrolled_dates[row],
+                'photo_path': self.photo_paths[row],
+                'recognition_count': int(self._counts[row])
+            }
+            for row in range(len(self.names))
+        ]
+    
+    @classmethod
+    def from_records(cls, dim: int, metadata: List[Dict], encodings: np.ndarray) -> "TrustedGallery":
+        """Build from row-aligned metadata dicts and an (N, D) encoding matrix"""
+        size = len(metadata)
+        gallery = cls(dim, capacity=max(16, size))
+        # Fill whole columns at once: one copy for the matrix, no per-person objects
+        gallery._encodings[:size] = encodings
+        gallery._counts[:size] = [data.get('recognition_count', 0) for data in metadata]
+        gallery.names = [data['name'] for data in metadata]
+        gallery.roles = [data['role'] for data in metadata]
+        gallery.enrolled_dates = [data['enrolled_date'] for data in metadata]
+        gallery.photo_paths = [data['photo_path'] for data in metadata]
+        gallery._rows = {name: row for row, name in enumerate(gallery.names)}
+        return gallery
+
 class FaceRecognitionConfig:
     """Configuration for face recognition system"""
     
@@ -86,12 +245,34 @@ class FaceRecognitionConfig:
     DATA_DIR = Path("data")
     FACES_DIR = DATA_DIR / "trusted_faces" / "photos"
     EMBEDDINGS_DIR = DATA_DIR / "trusted_faces" / "embeddings"
-    DB_FILE = EMBEDDINGS_DIR / "trusted_persons.pkl"
+    EMBEDDINGS_FILE = EMBEDDINGS_DIR / "embeddings.npy"  # (N, 128) float32, row order = metadata
+    METADATA_FILE = EMBEDDINGS_DIR / "metadata.json"
+    DB_FILE = EMBEDDINGS_DIR / "trusted_persons.pkl"  # Legacy pickle database, read if no .npy yet
     
     # Recognition parameters
     RECOGNITION_TOLERANCE = 0.6  # Lower = stricter (0.4-0.7 recommended)
-    FACE_DETECTION_MODEL = "hog"  # "hog" (faster, CPU) or "cnn" (accurate, GPU)
+    # Same rule on unit vectors: distance <= tol  <=>  cosine >= 1 - tol^2 / 2
+    COS_THRESHOLD = 1.0 - RECOGNITION_TOLERANCE ** 2 / 2
+    # "hog" (faster, CPU) or "cnn" (accurate, GPU); picks "cnn" when dlib can use CUDA
+    FACE_DETECTION_MODEL = "cnn" if _dlib_cuda_available() else "hog"
     MIN_FACE_SIZE = 50  # Minimum face size in pixels
+    ENCODING_DIM = 128  # face_recognition (dlib) encoding size
+    GALLERY_INT8 = True  # FAISS keeps the gallery as 8-bit codes (4x smaller scan)
+    DETECTION_SCALE = 0.25  # Frames are shrunk by this factor for face detection
+    # Linux webcams open through a GStreamer appsink that only ever holds the newest frame
+    USE_GSTREAMER = sys.platform.startswith("linux")
+    GSTREAMER_PIPELINE = (
+        "v4l2src device=/dev/video{index} ! image/jpeg,width=1280,height=720,framerate=30/1 ! "
+        "jpegdec ! videoconvert ! appsink drop=true max-buffers=1 sync=false"
+    )
+    ENROLL_OUTLIER_SIM = 0.5  # Webcam samples with a lower mean cosine to the rest are dropped
+    
+    # Face backend: "face_recognition" (dlib HOG + 128-D ResNet) or "insightface"
+    # (one ONNX Runtime pass: detector + 512-D ArcFace). Switching backends
+    # needs a re-enrollment, as the encodings aren't comparable.
+    FACE_BACKEND = "face_recognition"
+    INSIGHTFACE_MODEL = "buffalo_s"  # or "buffalo_l" (larger, more accurate)
+    INSIGHTFACE_COS_THRESHOLD = 0.4  # ArcFace cosine similarity for a match
     
     # Avengers personality mappings
     PERSONALITY_GREETINGS = {
@@ -128,15 +309,201 @@ class FaceRecognitionConfig:
 config = FaceRecognitionConfig()
 config.setup_directories()
 
+class InsightFaceBackend:
+    """InsightFace detection + ArcFace embedding in a single inference per frame"""
+    
+    ENCODING_DIM = 512
+    
+    def __init__(self, model_name: str = "buffalo_s", providers: Optional[List[str]] = None,
+                 det_size: Tuple[int, int] = (640, 640)):
+        from insightface.app import FaceAnalysis
+        
+        providers = providers or _onnx_providers()
+        self.app = FaceAnalysis(name=model_name, providers=providers)
+        # ctx_id 0 = first GPU, -1 = CPU
+        self.app.prepare(ctx_id=0 if 'CUDAExecutionProvider' in providers else -1, det_size=det_size)
+    
+    def detect(self, bgr_frame: np.ndarray) -> Tuple[List[Tuple[int, int, int, int]], np.ndarray]:
+        """
+        Find faces in a BGR frame (InsightFace's native channel order)
+        
+        Returns:
+            ([(top, right, bottom, left)], (F, 512) unit-length float32 embeddings)
+        """
+        faces = self.app.get(bgr_frame)
+        locations = [
+            (int(face.bbox[1]), int(face.bbox[2]), int(face.bbox[3]), int(face.bbox[0]))
+            for face in faces
+        ]
+        if not faces:
+            return locations, np.empty((0, self.ENCODING_DIM), dtype=np.float32)
+        return locations, np.stack([face.normed_embedding for face in faces]).astype(np.float32)
+
+_face_backend = None
+
+def get_face_backend() -> Optional[InsightFaceBackend]:
+    """Shared InsightFaceBackend when FACE_BACKEND is "insightface", else None (face_recognition)"""
+    global _face_backend
+    if _face_backend is None:
+        _face_backend = False
+        if FaceRecognitionConfig.FACE_BACKEND == "insightface":
+            try:
+                _face_backend = InsightFaceBackend(FaceRecognitionConfig.INSIGHTFACE_MODEL)
+                print(f"✅ InsightFace backend ready ({FaceRecognitionConfig.INSIGHTFACE_MODEL})")
+            except Exception as e:
+                print(f"⚠️  InsightFace unavailable ({e}); using face_recognition")
+    return _face_backend or None
+
+def open_webcam(index: int = 0) -> cv2.VideoCapture:
+    """
+    Open a webcam tuned for live processing
+    
+    Keeps a single buffered frame so read() returns the newest one instead
+    of a stale queued frame, and asks for MJPG so USB cameras skip slow
+    YUYV transfer/decoding. On Linux a GStreamer pipeline is tried first
+    (appsink drop=true max-buffers=1); the default backend is the fallback.
+    """
+    if FaceRecognitionConfig.USE_GSTREAMER:
+        video_capture = cv2.VideoCapture(
+            FaceRecognitionConfig.GSTREAMER_PIPELINE.format(index=index), cv2.CAP_GSTREAMER)
+        if video_capture.isOpened():
+            return video_capture
+        video_capture.release()
+    
+    video_capture = cv2.VideoCapture(index)
+    if video_capture.isOpened():
+        if not video_capture.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+            print("⚠️  Webcam backend ignored CAP_PROP_BUFFERSIZE; frames may lag")
+        video_capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    return video_capture
+
+class LatestFrameGrabber:
+    """
+    Reads a webcam on a background thread and keeps only the newest frame,
+    so slow processing never works through a backlog of stale frames
+    """
+    
+    def __init__(self, video_capture: cv2.VideoCapture):
+        self.video_capture = video_capture
+        self._cond = threading.Condition()
+        self._frame = None
+        self._seq = 0  # Frames captured so far
+        self._read_seq = 0  # Last frame handed out by read()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        while not self._stop.is_set():
+            ret, frame = self.video_capture.read()
+            if not ret:
+                self._stop.wait(0.01)
+                continue
+            with self._cond:
+                self._frame = frame
+                self._seq += 1
+                self._cond.notify_all()
+    
+    def read(self, timeout: float = 1.0) -> Tuple[bool, Optional[np.ndarray]]:
+        """Like VideoCapture.read(): waits for a frame newer than the last one returned"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq != self._read_seq or self._stop.is_set(), timeout)
+            if self._frame is None or self._seq == self._read_seq:
+                return False, None
+            self._read_seq = self._seq
+            return True, self._frame.copy()
+    
+    def stop(self):
+        """Stop the capture thread (the caller still releases the VideoCapture)"""
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
 # Cell 5: Face Enrollment System
 class FaceEnrollmentSystem:
     """Handles enrollment of trusted faces"""
     
     def __init__(self):
         self.config = FaceRecognitionConfig()
-        self.trusted_persons: Dict[str, TrustedPerson] = {}
+        self.backend = get_face_backend()
+        self.encoding_dim = self.backend.ENCODING_DIM if self.backend else self.config.ENCODING_DIM
+        self.trusted_persons = TrustedGallery(self.encoding_dim)
+        # Search index over the gallery's encodings: row i of the index is names_list[i]
+        self.index = self._new_index() if faiss is not None else None
+        self._dirty = False  # rows changed or moved since the index was built
+        self._writer = ThreadPoolExecutor(max_workers=1)  # JPEG encode + write off the preview loop
         self.load_database()
     
+    def _new_index(self):
+        """Empty inner-product FAISS index (8-bit scalar quantized if GALLERY_INT8)"""
+        dim = self.encoding_dim
+        if not self.config.GALLERY_INT8:
+            return faiss.IndexFlatIP(dim)
+        
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+        # Components of unit vectors lie in [-1, 1]; training on that fixed range
+        # means new enrollments never need the quantizer retrained
+        index.train(np.array([[-1.0] * dim, [1.0] * dim], dtype=np.float32))
+        return index
+    
+    @property
+    def names_list(self) -> List[str]:
+        """Enrolled names in gallery row order"""
+        return self.trusted_persons.names
+    
+    @property
+    def gallery(self) -> Tuple[List[str], np.ndarray]:
+        """(names_list, (N, D) unit-length gallery), re-indexing first if rows changed"""
+        if self._dirty:
+            self._rebuild_index()
+        return self.trusted_persons.names, self.trusted_persons.encodings
+    
+    def _rebuild_index(self):
+        """Rebuild the FAISS index from the gallery matrix in one batch"""
+        self._dirty = False
+        if faiss is not None:
+            self.index = self._new_index()
+            if len(self.trusted_persons):
+                self.index.add(self.trusted_persons.encodings)
+    
+    def _store_person(self, person: TrustedPerson):
+        """Add or replace a person in the gallery and keep the search index in step"""
+        replacing = person.name in self.trusted_persons
+        self.trusted_persons.add(person)
+        if replacing or self._dirty:
+            # A row changed in place: re-index lazily on the next search
+            self._dirty = True
+        elif faiss is not None:
+            self.index.add(self.trusted_persons.encodings[-1:])
+    
+    def search(self, encodings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Nearest enrolled face for each query encoding
+        
+        Args:
+            encodings: (F, 128) or (128,) query encodings
+        
+        Returns:
+            (cosine similarities, indices into names_list), each shape (F,)
+        """
+        queries = np.ascontiguousarray(normalize_encoding(encodings).reshape(-1, self.encoding_dim))
+        _, gallery = self.gallery
+        if faiss is not None:
+            similarities, indices = self.index.search(queries, 1)
+            indices = indices[:, 0]
+            if self.config.GALLERY_INT8:
+                # Re-score the chosen rows exactly against the float32 copy, so the
+                # match threshold isn't affected by quantization error
+                found = indices >= 0
+                exact = np.full(len(indices), -1.0, dtype=np.float32)
+                exact[found] = np.einsum('ij,ij->i', queries[found], gallery[indices[found]])
+                return exact, indices
+            return similarities[:, 0], indices
+        
+        # Gallery rows are unit length, so one matmul gives every cosine similarity
+        similarities = queries @ gallery.T
+        indices = similarities.argmax(axis=1)
+        return similarities[np.arange(len(indices)), indices], indices
+    
     def enroll_from_image(self, image_path: str, name: str, role: str = "friend") -> bool:
         """
         Enroll a person from an image file
@@ -158,11 +525,15 @@ class FaceEnrollmentSystem:
             image = face_recognition.load_image_file(image_path)
             print(f"✅ Image loaded: {image.shape}")
             
-            # Detect faces
-            face_locations = face_recognition.face_locations(
-                image, 
-                model=self.config.FACE_DETECTION_MODEL
-            )
+            # Detect faces (InsightFace also returns the embeddings)
+            embeddings = None
+            if self.backend is not None:
+                face_locations, embeddings = self.backend.detect(cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
+            else:
+                face_locations = face_recognition.face_locations(
+                    image, 
+                    model=self.config.FACE_DETECTION_MODEL
+                )
             
             if len(face_locations) == 0:
                 print("❌ No faces detected in image!")
@@ -171,10 +542,18 @@ class FaceEnrollmentSystem:
             if len(face_locations) > 1:
                 print(f"⚠️  Multiple faces detected ({len(face_locations)}). Using the largest face.")
                 # Use the largest face
-                face_locations = [max(face_locations, key=lambda loc: (loc[2] - loc[0]) * (loc[1] - loc[3]))]
+                largest = max(range(len(face_locations)),
+                              key=lambda i: (face_locations[i][2] - face_locations[i][0]) *
+                                            (face_locations[i][1] - face_locations[i][3]))
+                face_locations = [face_locations[largest]]
+                if embeddings is not None:
+                    embeddings = embeddings[largest:largest + 1]
             
             # Get face encoding
-            face_encodings = face_recognition.face_encodings(image, face_locations)
+            if embeddings is not None:
+                face_encodings = list(embeddings)
+            else:
+                face_encodings = face_recognition.face_encodings(image, face_locations)
             
             if len(face_encodings) == 0:
                 print("❌ Could not generate face encoding!")
@@ -186,13 +565,13 @@ class FaceEnrollmentSystem:
             person = TrustedPerson(
                 name=name,
                 role=role,
-                face_encoding=face_encoding,
+                face_encoding=normalize_encoding(face_encoding),
                 enrolled_date=datetime.now().isoformat(),
                 photo_path=image_path
             )
             
             # Save to database
-            self.trusted_persons[name] = person
+            self._store_person(person)
             self.save_database()
             
             print(f"✅ {name} enrolled successfully!")
@@ -228,15 +607,17 @@ class FaceEnrollmentSystem:
         print(f"{'='*60}\n")
         
         # Open webcam
-        video_capture = cv2.VideoCapture(0)
+        video_capture = open_webcam(0)
         
         if not video_capture.isOpened():
             print("❌ Could not access webcam!")
             return False
         
-        captured_encodings = []
+        captured_frames = []  # (rgb_frame, face_locations, embedding or None) per sample
+        photo_writes = []
         sample_count = 0
         
+        rgb_frame = None  # Reused conversion buffer; samples are copied out of it
         try:
             while sample_count < num_samples:
                 ret, frame = video_capture.read()
@@ -244,10 +625,15 @@ class FaceEnrollmentSystem:
                     continue
                 
                 # Convert BGR to RGB
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
                 
-                # Detect faces
-                face_locations = face_recognition.face_locations(rgb_frame)
+                # Detect faces (InsightFace also returns the embeddings)
+                embeddings = None
+                if self.backend is not None:
+                    face_locations, embeddings = self.backend.detect(frame)
+                else:
+                    face_locations = face_recognition.face_locations(
+                        rgb_frame, model=self.config.FACE_DETECTION_MODEL)
                 
                 # Draw rectangles around faces
                 display_frame = frame.copy()
@@ -272,42 +658,62 @@ class FaceEnrollmentSystem:
                 
                 elif key == 32:  # SPACE
                     if len(face_locations) == 1:
-                        # Get face encoding
-                        face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
-                        if len(face_encodings) > 0:
-                            captured_encodings.append(face_encodings[0])
-                            sample_count += 1
-                            print(f"✅ Sample {sample_count} captured!")
-                            
-                            # Save photo
-                            photo_path = self.config.FACES_DIR / f"{name}_{sample_count}.jpg"
-                            cv2.imwrite(str(photo_path), frame)
+                        # Keep the frame and its known face box; dlib encoding waits until capture ends
+                        captured_frames.append((rgb_frame.copy(), face_locations,
+                                                embeddings[0] if embeddings is not None else None))
+                        sample_count += 1
+                        print(f"✅ Sample {sample_count} captured!")
+                        
+                        # Save photo
+                        photo_path = self.config.FACES_DIR / f"{name}_{sample_count}.jpg"
+                        # (copied: the capture may reuse the frame buffer)
+                        photo_writes.append(self._writer.submit(cv2.imwrite, str(photo_path), frame.copy()))
                     else:
                         print(f"⚠️  Detected {len(face_locations)} faces. Ensure only one face is visible.")
             
             video_capture.release()
             cv2.destroyAllWindows()
             
+            # Encode all samples in one pass, reusing the boxes found during preview
+            captured_encodings = []
+            for sample_frame, sample_locations, embedding in captured_frames:
+                if embedding is not None:
+                    captured_encodings.append(embedding)
+                    continue
+                face_encodings = face_recognition.face_encodings(sample_frame, sample_locations)
+                if face_encodings:
+                    captured_encodings.append(face_encodings[0])
+            
             if len(captured_encodings) == 0:
                 print("❌ No valid samples captured!")
                 return False
             
-            # Average the encodings for better accuracy
-            avg_encoding = np.mean(captured_encodings, axis=0)
+            # Drop outlier samples (blur, head turned away), then average on the unit sphere
+            enc_mat = normalize_encoding(np.stack(captured_encodings))
+            if len(enc_mat) > 2:
+                mean_sims = (enc_mat @ enc_mat.T).mean(axis=1)
+                keep = mean_sims >= self.config.ENROLL_OUTLIER_SIM
+                if keep.any() and not keep.all():
+                    print(f"⚠️  Dropped {int((~keep).sum())} inconsistent sample(s)")
+                    enc_mat = enc_mat[keep]
+            avg_encoding = enc_mat.mean(axis=0)
+            
+            # Photos must be on disk before the database points at them
+            wait(photo_writes)
             
             # Create trusted person
             person = TrustedPerson(
                 name=name,
                 role=role,
-                face_encoding=avg_encoding,
+                face_encoding=normalize_encoding(avg_encoding),
                 enrolled_date=datetime.now().isoformat(),
                 photo_path=str(self.config.FACES_DIR / f"{name}_1.jpg")
             )
             
-            self.trusted_persons[name] = person
+            self._store_person(person)
             self.save_database()
             
-            print(f"\n✅ {name} enrolled successfully with {len(captured_encodings)} samples!")
+            print(f"\n✅ {name} enrolled successfully with {len(enc_mat)} samples!")
             print(f"{'='*60}\n")
             return True
             
@@ -318,21 +724,35 @@ class FaceEnrollmentSystem:
             return False
     
     def save_database(self):
-        """Save trusted persons database"""
-        data = {name: person.to_dict() for name, person in self.trusted_persons.items()}
-        with open(self.config.DB_FILE, 'wb') as f:
-            pickle.dump(data, f)
+        """Save trusted persons database (one float32 encoding array + JSON metadata)"""
+        np.save(self.config.EMBEDDINGS_FILE, self.trusted_persons.encodings)
+        with open(self.config.METADATA_FILE, 'w') as f:
+            json.dump(self.trusted_persons.metadata(), f, indent=2)
         print(f"💾 Database saved: {len(self.trusted_persons)} persons")
     
     def load_database(self):
         """Load trusted persons database"""
-        if self.config.DB_FILE.exists():
+        if self.config.EMBEDDINGS_FILE.exists() and self.config.METADATA_FILE.exists():
+            encodings = np.load(self.config.EMBEDDINGS_FILE)
+            if len(encodings) and encodings.shape[1] != self.encoding_dim:
+                print(f"⚠️  Database holds {encodings.shape[1]}-D encodings but the "
+                      f"{self.config.FACE_BACKEND} backend uses {self.encoding_dim}-D. "
+                      "Re-enroll to use it. Starting fresh.")
+                return
+            with open(self.config.METADATA_FILE) as f:
+                metadata = json.load(f)
+            self.trusted_persons = TrustedGallery.from_records(
+                self.encoding_dim, metadata, normalize_encoding(encodings))
+            self._dirty = True
+            print(f"📂 Database loaded: {len(self.trusted_persons)} persons")
+        elif self.config.DB_FILE.exists() and self.backend is None:
+            # Older pickle format; the next save writes the .npy + .json pair
             with open(self.config.DB_FILE, 'rb') as f:
                 data = pickle.load(f)
-                self.trusted_persons = {
-                    name: TrustedPerson.from_dict(person_data)
-                    for name, person_data in data.items()
-                }
+                self.trusted_persons = TrustedGallery.from_records(
+                    self.encoding_dim, list(data.values()),
+                    normalize_encoding([person_data['face_encoding'] for person_data in data.values()]))
+            self._dirty = True
             print(f"📂 Database loaded: {len(self.trusted_persons)} persons")
         else:
             print("📂 No existing database found. Starting fresh.")
@@ -356,6 +776,7 @@ class FaceEnrollmentSystem:
         """Remove a person from database"""
         if name in self.trusted_persons:
             del self.trusted_persons[name]
+            self._dirty = True
             self.save_database()
             print(f"✅ {name} removed from database")
         else:
@@ -364,12 +785,83 @@ class FaceEnrollmentSystem:
 print("📝 Enrollment System ready!")
 
 # Cell 6: Face Recognition Engine
+@dataclass
+class FaceTrack:
+    """A face followed across frames, with its last recognition result"""
+    bbox: Tuple[int, int, int, int]  # (top, right, bottom, left)
+    name: Optional[str]
+    confidence: float
+    encoded_at: int  # Tracker frame index of the last encoding
+
+def _box_iou(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> float:
+    """Intersection over union of two (top, right, bottom, left) boxes"""
+    inter_h = min(a[2], b[2]) - max(a[0], b[0])
+    inter_w = min(a[1], b[1]) - max(a[3], b[3])
+    if inter_h <= 0 or inter_w <= 0:
+        return 0.0
+    inter = inter_h * inter_w
+    area_a = (a[2] - a[0]) * (a[1] - a[3])
+    area_b = (b[2] - b[0]) * (b[1] - b[3])
+    return inter / float(area_a + area_b - inter)
+
+class SimpleTracker:
+    """
+    IoU association of face boxes between frames
+    
+    A face that overlaps a recently recognized track reuses that track's
+    result, so the expensive encoding + search only runs for new faces and
+    once every reencode_interval frames per tracked face.
+    """
+    
+    def __init__(self, iou_threshold: float = 0.5, reencode_interval: int = 30):
+        self.iou_threshold = iou_threshold
+        self.reencode_interval = reencode_interval
+        self.tracks: List[FaceTrack] = []
+        self.frame_index = 0
+    
+    def assign(self, locations: List[Tuple[int, int, int, int]]) -> List[Optional[FaceTrack]]:
+        """Greedily match this frame's boxes to existing tracks (None = no fresh match)"""
+        self.frame_index += 1
+        assigned = []
+        used = set()
+        for location in locations:
+            best, best_iou = None, self.iou_threshold
+            for i, track in enumerate(self.tracks):
+                if i in used:
+                    continue
+                iou = _box_iou(location, track.bbox)
+                if iou >= best_iou:
+                    best, best_iou = i, iou
+            
+            track = None
+            if best is not None:
+                used.add(best)
+                track = self.tracks[best]
+                if self.frame_index - track.encoded_at >= self.reencode_interval:
+                    track = None  # Due for re-recognition
+            assigned.append(track)
+        return assigned
+    
+    def update(self, locations, results, assigned):
+        """Replace the tracks with this frame's boxes and their (name, confidence)"""
+        self.tracks = [
+            FaceTrack(location, name, confidence,
+                      track.encoded_at if track is not None else self.frame_index)
+            for location, (name, confidence), track in zip(locations, results, assigned)
+        ]
+
 class FaceRecognitionEngine:
     """Real-time face recognition engine"""
     
     def __init__(self, enrollment_system: FaceEnrollmentSystem):
         self.enrollment_system = enrollment_system
         self.config = FaceRecognitionConfig()
+        self.backend = enrollment_system.backend
+        self.cos_threshold = (self.config.INSIGHTFACE_COS_THRESHOLD if self.backend
+                              else self.config.COS_THRESHOLD)
+        self._rgb_buf = None  # Full-resolution RGB buffer reused across frames
+        self._greetings = {role: tuple(msgs) for role, msgs in self.config.PERSONALITY_GREETINGS.items()}
+        self._intruder_messages = tuple(self.config.INTRUDER_MESSAGES)
         self.recognition_log = []
     
     def recognize_face(self, face_encoding: np.ndarray) -> Tuple[Optional[str], float]:
@@ -379,105 +871,166 @@ class FaceRecognitionEngine:
         Returns:
             (name, confidence) or (None, 0) if unknown
         """
-        if not self.enrollment_system.trusted_persons:
-            return None, 0.0
+        return self.recognize_batch(np.asarray(face_encoding)[None, :])[0]
+    
+    def recognize_batch(self, encodings: np.ndarray) -> List[Tuple[Optional[str], float]]:
+        """
+        Recognize every face in a frame with one index search
         
-        # Get all known encodings and names
-        known_encodings = [
-            person.face_encoding 
-            for person in self.enrollment_system.trusted_persons.values()
-        ]
-        known_names = list(self.enrollment_system.trusted_persons.keys())
+        Args:
+            encodings: (F, 128) face encodings
         
-        # Compare faces
-        matches = face_recognition.compare_faces(
-            known_encodings, 
-            face_encoding, 
-            tolerance=self.config.RECOGNITION_TOLERANCE
-        )
+        Returns:
+            [(name, confidence) or (None, 0) if unknown] for each row
+        """
+        names_list, _ = self.enrollment_system.gallery
+        if not names_list:
+            return [(None, 0.0)] * len(encodings)
         
-        # Get face distances
-        face_distances = face_recognition.face_distance(known_encodings, face_encoding)
+        # One nearest-neighbour search for all faces (cosine similarities)
+        similarities, indices = self.enrollment_system.search(encodings)
+        matched = similarities >= self.cos_threshold
+        # Report confidence as 1 - distance, as before (unit vectors: d^2 = 2 - 2cos)
+        confidences = 1.0 - np.sqrt(np.maximum(2.0 - 2.0 * similarities, 0.0))
         
-        # Find best match
-        if True in matches:
-            best_match_index = np.argmin(face_distances)
-            if matches[best_match_index]:
-                name = known_names[best_match_index]
-                confidence = 1.0 - face_distances[best_match_index]
-                
-                # Update recognition count
-                self.enrollment_system.trusted_persons[name].recognition_count += 1
-                
-                return name, confidence
+        # Update recognition counts in place
+        np.add.at(self.enrollment_system.trusted_persons.counts, indices[matched], 1)
         
-        return None, 0.0
+        results = []
+        for is_match, index, confidence in zip(matched.tolist(), indices.tolist(), confidences.tolist()):
+            if is_match:
+                name = names_list[index]
+                results.append((name, confidence))
+            else:
+                results.append((None, 0.0))
+        return results
     
-    def process_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, List[Dict]]:
+    def process_frame(self, frame: np.ndarray, tracker: Optional[SimpleTracker] = None,
+                      annotate: bool = True) -> Tuple[np.ndarray, List[Dict]]:
         """
         Process a video frame for face recognition
         
+        Args:
+            frame: BGR frame
+            tracker: Optional SimpleTracker; faces it is already following
+                     skip encoding until they're due for re-recognition
+            annotate: Draw the detections on a copy of the frame (False returns frame as is)
+        
         Returns:
             (annotated_frame, detections)
             detections: List of {name, role, confidence, location}
         """
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        embeddings = None
+        if self.backend is not None:
+            # One InsightFace pass gives both boxes and embeddings
+            face_locations, embeddings = self.backend.detect(frame)
+        else:
+            # Detect faces on a downscaled copy (detector cost scales with pixel count),
+            # then map the boxes back to full resolution
+            # (resize first, so only the small copy goes through BGR -> RGB)
+            scale = self.config.DETECTION_SCALE
+            small_frame = cv2.cvtColor(
+                cv2.resize(frame, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA),
+                cv2.COLOR_BGR2RGB)
+            face_locations = [
+                (int(top / scale), int(right / scale), int(bottom / scale), int(left / scale))
+                for (top, right, bottom, left) in face_recognition.face_locations(
+                    small_frame, model=self.config.FACE_DETECTION_MODEL)
+            ]
+        
+        # Drop faces too small to recognize reliably (distant people, false positives)
+        min_size = self.config.MIN_FACE_SIZE
+        keep = [i for i, (top, right, bottom, left) in enumerate(face_locations)
+                if bottom - top >= min_size and right - left >= min_size]
+        if len(keep) < len(face_locations):
+            face_locations = [face_locations[i] for i in keep]
+            if embeddings is not None:
+                embeddings = embeddings[keep]
+        
+        # Only encode faces the tracker isn't already following
+        assigned = tracker.assign(face_locations) if tracker is not None else [None] * len(face_locations)
+        to_encode = [i for i, track in enumerate(assigned) if track is None]
+        
+        # Encodings use the full-resolution faces: the encoder works on a fixed-size
+        # face chip, so it costs the same either way and keeps accuracy
+        if embeddings is not None:
+            face_encodings = list(embeddings[to_encode])
+        elif to_encode:
+            # Full-resolution RGB only when dlib has faces to encode
+            self._rgb_buf = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+            face_encodings = face_recognition.face_encodings(
+                self._rgb_buf, [face_locations[i] for i in to_encode])
+        else:
+            face_encodings = []
         
-        # Detect faces
-        face_locations = face_recognition.face_locations(rgb_frame)
-        face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
+        # Recognize all new faces at once, reuse tracked results for the rest
+        fresh = self.recognize_batch(np.asarray(face_encodings, dtype=np.float32)) if face_encodings else []
+        matches = [(track.name, track.confidence) if track is not None else None for track in assigned]
+        for i, result in zip(to_encode, fresh):
+            matches[i] = result
+        if tracker is not None:
+            tracker.update(face_locations, matches, assigned)
         
         detections = []
-        annotated_frame = frame.copy()
+        # Locals for the per-face loop
+        persons = self.enrollment_system.trusted_persons
+        add_detection = detections.append
         
-        for (top, right, bottom, left), face_encoding in zip(face_locations, face_encodings):
-            # Recognize face
-            name, confidence = self.recognize_face(face_encoding)
-            
+        for location, (name, confidence) in zip(face_locations, matches):
             if name:
                 # Trusted person
-                person = self.enrollment_system.trusted_persons[name]
-                label = f"{name} ({person.role})"
-                color = (0, 255, 0)  # Green
-                
-                detections.append({
+                add_detection({
                     'name': name,
-                    'role': person.role,
+                    'role': persons[name].role,
                     'confidence': confidence,
-                    'location': (top, right, bottom, left),
+                    'location': location,
                     'trusted': True
                 })
             else:
                 # Unknown person
-                label = "UNKNOWN INTRUDER"
-                color = (0, 0, 255)  # Red
-                
-                detections.append({
+                add_detection({
                     'name': 'Unknown',
                     'role': 'intruder',
                     'confidence': 0.0,
-                    'location': (top, right, bottom, left),
+                    'location': location,
                     'trusted': False
                 })
+        
+        if not annotate:
+            return frame, detections
+        return self.draw_detections(frame.copy(), detections), detections
+    
+    def draw_detections(self, frame: np.ndarray, detections: List[Dict]) -> np.ndarray:
+        """Draw detection boxes and labels onto frame in place (and return it)"""
+        cv_rect = cv2.rectangle
+        cv_put = cv2.putText
+        
+        for detection in detections:
+            top, right, bottom, left = detection['location']
+            if detection['trusted']:
+                label = f"{detection['name']} ({detection['role']})"
+                color = (0, 255, 0)  # Green
+            else:
+                label = "UNKNOWN INTRUDER"
+                color = (0, 0, 255)  # Red
             
             # Draw rectangle
-            cv2.rectangle(annotated_frame, (left, top), (right, bottom), color, 2)
+            cv_rect(frame, (left, top), (right, bottom), color, 2)
             
             # Draw label background
-            cv2.rectangle(annotated_frame, (left, bottom - 35), (right, bottom), color, cv2.FILLED)
+            cv_rect(frame, (left, bottom - 35), (right, bottom), color, cv2.FILLED)
             
             # Draw label text
-            cv2.putText(annotated_frame, label, (left + 6, bottom - 6),
-                       cv2.FONT_HERSHEY_DUPLEX, 0.6, (255, 255, 255), 1)
+            cv_put(frame, label, (left + 6, bottom - 6),
+                   cv2.FONT_HERSHEY_DUPLEX, 0.6, (255, 255, 255), 1)
             
             # Draw confidence
-            if name:
-                conf_text = f"{confidence:.2f}"
-                cv2.putText(annotated_frame, conf_text, (left + 6, top - 6),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+            if detection['trusted']:
+                conf_text = f"{detection['confidence']:.2f}"
+                cv_put(frame, conf_text, (left + 6, top - 6),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
         
-        return annotated_frame, detections
+        return frame
     
     def get_greeting(self, person_name: str) -> str:
         """Get Avengers-themed greeting for recognized person"""
@@ -485,14 +1038,11 @@ class FaceRecognitionEngine:
         if not person:
             return "Access granted."
         
-        import random
-        greetings = self.config.PERSONALITY_GREETINGS.get(person.role, ["Welcome back."])
-        return random.choice(greetings)
+        return random.choice(self._greetings.get(person.role, ("Welcome back.",)))
     
     def get_intruder_message(self, escalation_level: int = 1) -> str:
         """Get intruder warning message"""
-        import random
-        return random.choice(self.config.INTRUDER_MESSAGES)
+        return random.choice(self._intruder_messages)
     
     def log_detection(self, detection: Dict):
         """Log a detection event"""
@@ -507,6 +1057,33 @@ class FaceRecognitionEngine:
 print("🔍 Recognition Engine ready!")
 
 # Cell 7: Live Recognition Demo
+def _put_latest(q: queue.Queue, item):
+    """Put into a maxsize=1 queue, replacing a stale item nobody has taken yet"""
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        q.put_nowait(item)
+
+def _recognition_worker(engine: FaceRecognitionEngine, tracker: SimpleTracker,
+                        frame_q: queue.Queue, result_q: queue.Queue, stop: threading.Event):
+    """Recognize the newest frame handed over by the display loop, publish its detections"""
+    while not stop.is_set():
+        try:
+            frame = frame_q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        try:
+            _, detections = engine.process_frame(frame, tracker=tracker, annotate=False)
+        except Exception as e:
+            # Skip the bad frame; the preview keeps the last detections meanwhile
+            print(f"❌ Recognition failed on a frame: {e}")
+            continue
+        _put_latest(result_q, detections)
+
 def run_live_recognition(duration: int = 30):
     """
     Run live face recognition from webcam
@@ -531,7 +1108,7 @@ def run_live_recognition(duration: int = 30):
     enrollment.list_enrolled()
     
     # Open webcam
-    video_capture = cv2.VideoCapture(0)
+    video_capture = open_webcam(0)
     
     if not video_capture.isOpened():
         print("❌ Could not access webcam!")
@@ -542,21 +1119,39 @@ def run_live_recognition(duration: int = 30):
     
     start_time = time.time()
     frame_count = 0
+    recognized_count = 0
     detections_count = 0
+    # Pipeline: capture thread -> display loop -> recognition worker -> display loop.
+    # Each hand-off holds one item, so a slow stage only ever sees the newest frame
+    # and the preview keeps camera speed while annotations update as results land.
+    grabber = LatestFrameGrabber(video_capture)
+    frame_q = queue.Queue(maxsize=1)
+    result_q = queue.Queue(maxsize=1)
+    stop = threading.Event()
+    worker = threading.Thread(
+        target=_recognition_worker,
+        args=(engine, SimpleTracker(), frame_q, result_q, stop),
+        daemon=True
+    )
+    worker.start()
+    detections = []
     
     try:
         while (time.time() - start_time) < duration:
-            ret, frame = video_capture.read()
+            ret, frame = grabber.read()
             if not ret:
                 continue
             
             frame_count += 1
+            _put_latest(frame_q, frame)
             
-            # Process every 3rd frame for performance
-            if frame_count % 3 == 0:
-                annotated_frame, detections = engine.process_frame(frame)
-                
-                # Log and announce detections
+            try:
+                detections = result_q.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                recognized_count += 1
+                # Log and announce new detections
                 for detection in detections:
                     if detection['trusted']:
                         print(f"✅ Recognized: {detection['name']} ({detection['confidence']:.2f})")
@@ -566,15 +1161,20 @@ def run_live_recognition(duration: int = 30):
                         detections_count += 1
                     
                     engine.log_detection(detection)
-                
-                # Display frame
-                cv2.imshow('Avengers Guard - Face Recognition (Press q to quit)', annotated_frame)
+            
+            # Display the freshest frame with the latest known detections
+            # (the worker only reads its frame, so drawing on a copy keeps them apart)
+            annotated_frame = engine.draw_detections(frame.copy(), detections)
+            cv2.imshow('Avengers Guard - Face Recognition (Press q to quit)', annotated_frame)
             
             # Check for quit
             if cv2.waitKey(1) & 0xFF == ord('q'):
                 break
         
     finally:
+        stop.set()
+        worker.join(timeout=2.0)
+        grabber.stop()
         video_capture.release()
         cv2.destroyAllWindows()
     
@@ -583,7 +1183,8 @@ def run_live_recognition(duration: int = 30):
     print("📊 RECOGNITION SUMMARY")
     print(f"{'='*60}")
     print(f"Duration: {int(time.time() - start_time)} seconds")
-    print(f"Frames processed: {frame_count}")
+    print(f"Frames displayed: {frame_count}")
+    print(f"Frames recognized: {recognized_count}")
     print(f"Detections: {detections_count}")
     print(f"Recognition log entries: {len(engine.recognition_log)}")
     print(f"{'='*60}\n")
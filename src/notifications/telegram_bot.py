@@ -4,12 +4,211 @@ Sends alerts to your phone via Telegram bot
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import logging
+import os
 import time
-from datetime import datetime
-from typing import Optional
+import queue
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Optional, TYPE_CHECKING
 import io
-from PIL import Image
-import numpy as np
+
+if TYPE_CHECKING:
+    import numpy as np
+
+try:
+    import orjson  # faster JSON bodies for sendMessage
+except ImportError:
+    orjson = None
+
+try:
+    # Streams multipart uploads instead of building the whole body in memory
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+from src.core.guard_log import get_logger
+
+
+class _RepeatFilter(logging.Filter):
+    """Drop a warning/error whose message template was already logged in the last `window` seconds"""
+    
+    def __init__(self, window: float = 10.0):
+        super().__init__()
+        self.window = window
+        self._last_emit = {}
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING:
+            return True
+        now = time.monotonic()
+        last = self._last_emit.get(record.msg)
+        if last is not None and now - last < self.window:
+            return False
+        self._last_emit[record.msg] = now
+        return True
+
+
+# Failed sends repeat in bursts (e.g. a 429 storm): log each kind once per 10 s
+logger = get_logger("telegram")
+logger.addFilter(_RepeatFilter())
+
+JPEG_QUALITY = 75
+# Telegram re-encodes photos down to about 1280 px on the long side anyway, so
+# shrinking first costs no visible quality but cuts encode time and upload size
+MAX_PHOTO_DIM = 1280
+# Intruder alerts from one agent within this window are merged into one send
+ALERT_COALESCE_SECONDS = 2.0
+# Token bucket for Telegram's per-chat limit (about 1 message/s, short bursts allowed)
+CHAT_RATE_PER_SECOND = 1.0
+CHAT_BURST = 3
+
+# Alert message templates (HTML parse mode), filled with str.format
+_INTRUDER_TMPL = """
+🚨 <b>AVENGERS GUARD ALERT</b>
+
+⚠️ <b>Intruder Detected</b>
+{threat_emoji} Threat Level: {threat_level}/4
+⏰ Time: {time}
+🤖 Agent: {agent_name}
+📍 Location: Your Room
+
+<i>Agent Response: Escalating security protocol...</i>
+
+💬 Reply 'STATUS' for update
+💬 Reply 'DISARM' to deactivate
+"""
+
+_ACTIVATION_TMPL = """
+🛡️ <b>AVENGERS GUARD ACTIVATED</b>
+
+✅ System Online
+🤖 Active Agent: {agent_name}
+⏰ Time: {time}
+📍 Location: Your Room
+
+<i>Your room is now under protection.</i>
+"""
+
+_DEACTIVATION_TMPL = """
+🔓 <b>AVENGERS GUARD DEACTIVATED</b>
+
+✅ System Offline
+⏱️ Duration: {duration}
+⏰ Time: {time}
+
+<i>Room security has been disengaged.</i>
+"""
+
+_WELCOME_TMPL = """
+👋 <b>Welcome Home</b>
+
+✅ Trusted Person Recognized
+👤 Name: {person_name}
+🎭 Role: {role}
+⏰ Time: {time}
+
+<i>Access granted. Welcome back!</i>
+"""
+
+_DAILY_SUMMARY_TMPL = """
+📊 <b>DAILY SECURITY REPORT</b>
+
+📅 Date: {date}
+
+<b>Statistics:</b>
+🔒 Activations: {activations}
+⚠️ Intruders Detected: {intruders}
+✅ Trusted Persons: {recognized}
+
+<i>Keep your room secure with Avengers Guard!</i>
+"""
+
+_THREAT_EMOJI = ("🟢", "🟡", "🟠", "🔴")
+
+# Intruder body per threat level (1-4) with emoji and level baked in;
+# only the time and agent name are filled per alert
+_INTRUDER_BODIES = {
+    level: _INTRUDER_TMPL.replace("{threat_emoji}", emoji).replace("{threat_level}", str(level))
+    for level, emoji in enumerate(_THREAT_EMOJI, start=1)
+}
+
+
+def _now_hms() -> str:
+    """Local wall-clock time as HH:MM:SS"""
+    return time.strftime('%H:%M:%S')
+
+
+def _today() -> str:
+    """Local date as YYYY-MM-DD"""
+    return time.strftime('%Y-%m-%d')
+
+
+@lru_cache(maxsize=None)
+def _imaging():
+    """
+    Image libraries, imported on the first photo rather than with the module
+    (most alerts are text only)
+    
+    Returns:
+        (simplejpeg, cv2, PIL.Image), None for any that isn't installed
+    """
+    try:
+        import simplejpeg  # fastest JPEG encoder for numpy frames
+    except ImportError:
+        simplejpeg = None
+    try:
+        import cv2
+    except ImportError:
+        cv2 = None
+    try:
+        from PIL import Image  # only for PIL Image inputs and the last-resort encoder
+    except ImportError:
+        Image = None
+    return simplejpeg, cv2, Image
+
+
+def _fit_frame(frame: "np.ndarray", max_dim: int = MAX_PHOTO_DIM) -> "np.ndarray":
+    """Downscale a frame (keeping aspect ratio) so its long side is at most max_dim"""
+    h, w = frame.shape[:2]
+    scale = max_dim / max(h, w)
+    if scale >= 1:
+        return frame
+    _, cv2, _ = _imaging()
+    if cv2 is not None:
+        return cv2.resize(frame, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+    step = -(-max(h, w) // max_dim)  # ceil: plain subsampling without OpenCV
+    return frame[::step, ::step]
+
+
+def _encode_jpeg(frame: "np.ndarray", quality: int = JPEG_QUALITY, colorspace: str = 'BGR') -> bytes:
+    """
+    JPEG-encode a uint8 HxWx3 frame straight from its pixel buffer
+    
+    Uses simplejpeg, else cv2.imencode, else PIL. colorspace is the frame's
+    channel order: 'BGR' (OpenCV) or 'RGB'.
+    """
+    import numpy as np
+    
+    simplejpeg, cv2, Image = _imaging()
+    frame = np.ascontiguousarray(frame)
+    if simplejpeg is not None:
+        return simplejpeg.encode_jpeg(frame, quality=quality, colorspace=colorspace, fastdct=True)
+    if colorspace == 'RGB' and cv2 is not None or colorspace == 'BGR' and cv2 is None:
+        frame = np.ascontiguousarray(frame[:, :, ::-1])  # cv2 wants BGR, PIL wants RGB
+    if cv2 is not None:
+        ok, buf = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            raise ValueError("cv2.imencode failed")
+        return buf.tobytes()
+    if Image is None:
+        raise ImportError("encoding a frame needs simplejpeg, opencv-python or Pillow")
+    img_bytes = io.BytesIO()
+    Image.fromarray(frame).save(img_bytes, format='JPEG', quality=quality)
+    return img_bytes.getvalue()
 
 
 class TelegramNotifier:
@@ -30,22 +229,79 @@ class TelegramNotifier:
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
         self.enabled = True
         
-        # Test connection
+        # Endpoints and the fixed part of each payload, built once
+        self._getme_url = f"{self.base_url}/getMe"
+        self._send_message_url = f"{self.base_url}/sendMessage"
+        self._send_photo_url = f"{self.base_url}/sendPhoto"
+        self._message_data = {"chat_id": self.chat_id, "parse_mode": "HTML"}
+        # (str: MultipartEncoder only accepts string fields; chat IDs are often ints)
+        self._photo_data = {"chat_id": str(self.chat_id)}
+        
+        # One keep-alive session: alerts reuse the TCP + TLS connection to
+        # api.telegram.org instead of a fresh handshake per request
+        self.session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.3,
+                        status_forcelist=[429, 500, 502, 503, 504],
+                        allowed_methods=None)  # sends are POSTs; retry them too
+        self.session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=10,
+                                                   max_retries=retries))
+        self.session.headers.update({"Connection": "keep-alive"})
+        if MultipartEncoder is not None:
+            # A streamed upload can't be replayed once read, so sendPhoto only
+            # retries failures that happen before the body is sent
+            self.session.mount(self._send_photo_url, HTTPAdapter(
+                max_retries=Retry(connect=3, read=0, status=0, other=0, backoff_factor=0.3)))
+        
+        # Per-chat send budget, so bursts wait here instead of drawing 429s
+        self._tokens = float(CHAT_BURST)
+        self._last_refill = time.monotonic()
+        self._rate_lock = threading.Lock()
+        
+        # Alerts go out from one background thread, so detection code never
+        # waits on Telegram; each send_*_alert returns a Future[bool]
+        self._jobs = queue.Queue(maxsize=128)
+        self._sender = threading.Thread(target=self._drain, daemon=True)
+        self._sender.start()
+        
+        # Test connection in the background so startup doesn't wait on the network;
+        # callers that need the answer use wait_connected()
+        self.connected_event = threading.Event()
+        threading.Thread(target=self._check_connection, daemon=True).start()
+    
+    def _check_connection(self):
         if self.test_connection():
-            print("✅ Telegram bot connected successfully!")
+            self.connected_event.set()
+            logger.info("✅ Telegram bot connected successfully!")
         else:
-            print("⚠️  Telegram bot connection failed. Check token and chat_id.")
+            self.enabled = False
+            logger.warning("⚠️  Telegram bot connection failed. Check token and chat_id. "
+                           "Notifications disabled (call enable() to retry sending).")
+    
+    def wait_connected(self, timeout: float = 5) -> bool:
+        """Wait for the startup connection test; True if the bot is reachable"""
+        return self.connected_event.wait(timeout)
     
     def test_connection(self) -> bool:
         """Test if bot token and chat_id are valid"""
         try:
-            url = f"{self.base_url}/getMe"
-            response = requests.get(url, timeout=5)
+            response = self.session.get(self._getme_url, timeout=5)
             return response.status_code == 200
         except Exception as e:
-            print(f"❌ Connection test failed: {e}")
+            logger.error("❌ Connection test failed: %s", e)
             return False
     
+    def _throttle(self):
+        """Block until the per-chat token bucket allows another send"""
+        with self._rate_lock:
+            now = time.monotonic()
+            self._tokens = min(CHAT_BURST, self._tokens + (now - self._last_refill) * CHAT_RATE_PER_SECOND)
+            self._last_refill = now
+            if self._tokens < 1.0:
+                time.sleep((1.0 - self._tokens) / CHAT_RATE_PER_SECOND)
+                self._tokens = 1.0
+                self._last_refill = time.monotonic()
+            self._tokens -= 1.0
+    
     def send_message(self, message: str, parse_mode: str = "HTML") -> bool:
         """
         Send text message
@@ -60,33 +316,40 @@ class TelegramNotifier:
         if not self.enabled:
             return False
         
+        self._throttle()
         try:
-            url = f"{self.base_url}/sendMessage"
-            data = {
-                "chat_id": self.chat_id,
-                "text": message,
-                "parse_mode": parse_mode
-            }
+            data = self._message_data.copy()
+            data["text"] = message
+            if parse_mode != "HTML":
+                data["parse_mode"] = parse_mode
             
-            response = requests.post(url, data=data, timeout=10)
+            # JSON body rather than form encoding (the Bot API accepts both)
+            if orjson is not None:
+                response = self.session.post(self._send_message_url, data=orjson.dumps(data),
+                                             headers={"Content-Type": "application/json"}, timeout=10)
+            else:
+                response = self.session.post(self._send_message_url, json=data, timeout=10)
             
             if response.status_code == 200:
                 return True
             else:
-                print(f"❌ Failed to send message: {response.status_code}")
+                logger.warning("❌ Failed to send message: %d", response.status_code)
                 return False
                 
         except Exception as e:
-            print(f"❌ Error sending message: {e}")
+            logger.error("❌ Error sending message: %s", e)
             return False
     
-    def send_photo(self, image, caption: str = "") -> bool:
+    def send_photo(self, image, caption: str = "", parse_mode: Optional[str] = None,
+                   colorspace: str = 'BGR') -> bool:
         """
         Send photo with optional caption
         
         Args:
-            image: numpy array, PIL Image, or file path
-            caption: Photo caption
+            image: numpy array (BGR, as from OpenCV), PIL Image, or file path
+            caption: Photo caption (up to 1024 characters)
+            parse_mode: None (plain caption), "HTML" or "Markdown"
+            colorspace: Channel order of a numpy image, 'BGR' or 'RGB'
         
         Returns:
             True if sent successfully
@@ -94,157 +357,233 @@ class TelegramNotifier:
         if not self.enabled:
             return False
         
+        self._throttle()
         try:
-            url = f"{self.base_url}/sendPhoto"
-            
             # Convert image to bytes
+            import numpy as np
+            
+            Image = _imaging()[2]
             if isinstance(image, np.ndarray):
-                # Convert numpy array to PIL Image
-                img = Image.fromarray(image)
-                img_bytes = io.BytesIO()
-                img.save(img_bytes, format='JPEG')
-                img_bytes.seek(0)
-                photo = img_bytes
-            elif isinstance(image, Image.Image):
+                photo = ("frame.jpg", _encode_jpeg(_fit_frame(image), colorspace=colorspace), "image/jpeg")
+            elif Image is not None and isinstance(image, Image.Image):
                 # PIL Image
                 img_bytes = io.BytesIO()
                 image.save(img_bytes, format='JPEG')
-                img_bytes.seek(0)
-                photo = img_bytes
+                photo = ("photo.jpg", img_bytes.getvalue(), "image/jpeg")
             else:
                 # Assume file path
-                photo = open(image, 'rb')
-            
-            data = {
-                "chat_id": self.chat_id,
-                "caption": caption
-            }
+                with open(image, 'rb') as f:
+                    photo = (os.path.basename(image), f.read(), "application/octet-stream")
             
-            files = {"photo": photo}
+            data = self._photo_data.copy()
+            data["caption"] = caption
+            if parse_mode:
+                data["parse_mode"] = parse_mode
             
-            response = requests.post(url, data=data, files=files, timeout=15)
+            if MultipartEncoder is not None:
+                data["photo"] = photo
+                body = MultipartEncoder(fields=data)
+                response = self.session.post(self._send_photo_url, data=body,
+                                             headers={"Content-Type": body.content_type}, timeout=15)
+            else:
+                response = self.session.post(self._send_photo_url, data=data,
+                                             files={"photo": photo}, timeout=15)
             
             if response.status_code == 200:
                 return True
             else:
-                print(f"❌ Failed to send photo: {response.status_code}")
+                logger.warning("❌ Failed to send photo: %d", response.status_code)
                 return False
                 
         except Exception as e:
-            print(f"❌ Error sending photo: {e}")
+            logger.error("❌ Error sending photo: %s", e)
             return False
     
-    def send_intruder_alert(self, agent_name: str, threat_level: int, 
-                           image: Optional[np.ndarray] = None) -> bool:
+    def _submit(self, send, *args) -> Future:
+        """Queue send(*args) for the sender thread; the Future resolves to its result"""
+        future = Future()
+        try:
+            self._jobs.put_nowait((future, send, args))
+        except queue.Full:
+            logger.warning("⚠️  Telegram send queue full; alert dropped")
+            future.set_result(False)
+        return future
+    
+    def _drain(self):
         """
-        Send formatted intruder alert
+        Sender thread: run queued sends in order until close()
         
-        Args:
-            agent_name: Which agent detected the intruder
-            threat_level: 1-4
-            image: Optional image of intruder
+        The first intruder alert from an agent goes out at once and opens a
+        coalescing window; alerts from that agent arriving inside the window
+        are held and merged (highest threat level, latest photo) into a
+        single send when it closes, which opens the next window.
         """
-        # Format threat level emoji
-        threat_emoji = ["🟢", "🟡", "🟠", "🔴"][min(threat_level - 1, 3)]
+        bursts = {}  # agent_name -> {"until": window end, "held": merged alert or None}
+        while True:
+            timeout = None
+            if bursts:
+                timeout = max(0.0, min(burst["until"] for burst in bursts.values()) - time.monotonic())
+            try:
+                job = self._jobs.get(timeout=timeout)
+            except queue.Empty:
+                job = ()  # a window closed
+            
+            if job is None:
+                for agent_name, burst in bursts.items():
+                    if burst["held"] is not None:
+                        self._send_held(agent_name, burst["held"])
+                return
+            
+            if job:
+                future, send, args = job
+                if send == self._deliver_intruder_alert:
+                    self._coalesce(bursts, future, args)
+                else:
+                    self._run([future], send, args)
+            
+            now = time.monotonic()
+            for agent_name, burst in list(bursts.items()):
+                if burst["until"] > now:
+                    continue
+                if burst["held"] is None:
+                    del bursts[agent_name]
+                else:
+                    held, burst["held"] = burst["held"], None
+                    self._send_held(agent_name, held)
+                    burst["until"] = time.monotonic() + ALERT_COALESCE_SECONDS
+    
+    def _coalesce(self, bursts: dict, future: Future, args: tuple):
+        """Send an intruder alert now, or hold it for its agent's open window"""
+        agent_name, threat_level, image, detected_at = args
+        burst = bursts.get(agent_name)
+        if burst is None:
+            self._run([future], self._deliver_intruder_alert, args)
+            bursts[agent_name] = {"until": time.monotonic() + ALERT_COALESCE_SECONDS, "held": None}
+            return
         
-        # Create message
-        message = f"""
-🚨 <b>AVENGERS GUARD ALERT</b>
-
-⚠️ <b>Intruder Detected</b>
-{threat_emoji} Threat Level: {threat_level}/4
-⏰ Time: {datetime.now().strftime('%H:%M:%S')}
-🤖 Agent: {agent_name}
-📍 Location: Your Room
-
-<i>Agent Response: Escalating security protocol...</i>
-
-💬 Reply 'STATUS' for update
-💬 Reply 'DISARM' to deactivate
-"""
+        held = burst["held"]
+        if held is None:
+            burst["held"] = {"futures": [future], "threat_level": threat_level,
+                             "image": image, "detected_at": detected_at}
+        else:
+            held["futures"].append(future)
+            held["threat_level"] = max(held["threat_level"], threat_level)
+            held["detected_at"] = detected_at
+            if image is not None:
+                held["image"] = image
+    
+    def _send_held(self, agent_name: str, held: dict):
+        self._run(held["futures"], self._deliver_intruder_alert,
+                  (agent_name, held["threat_level"], held["image"], held["detected_at"]))
+    
+    def _run(self, futures: list, send, args: tuple):
+        """Call send(*args) once and resolve every (still wanted) future with the result"""
+        futures = [future for future in futures if future.set_running_or_notify_cancel()]
+        if not futures:
+            return
+        try:
+            result = send(*args)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        for future in futures:
+            future.set_result(result)
+    
+    def _deliver_intruder_alert(self, agent_name: str, threat_level: int, image, detected_at: str) -> bool:
+        """Send the intruder alert: one sendPhoto with the alert as caption, or text only"""
+        body = _INTRUDER_BODIES.get(threat_level)
+        if body is not None:
+            message = body.format(time=detected_at, agent_name=agent_name)
+        else:
+            message = _INTRUDER_TMPL.format(
+                threat_emoji=_THREAT_EMOJI[max(0, min(threat_level - 1, 3))],
+                threat_level=threat_level,
+                time=detected_at,
+                agent_name=agent_name
+            )
         
-        # Send message
-        success = self.send_message(message)
+        # With a photo, the alert text rides along as its caption: one request
+        # instead of a message followed by a separate photo upload
+        if image is not None:
+            caption = f"{message}\n📸 Intruder captured by {agent_name}"
+            if self.send_photo(image, caption, parse_mode="HTML"):
+                return True
+        return self.send_message(message)
+    
+    def send_intruder_alert(self, agent_name: str, threat_level: int, 
+                           image: Optional["np.ndarray"] = None) -> Future:
+        """
+        Send formatted intruder alert (in the background)
         
-        # Send photo if provided
-        if success and image is not None:
-            caption = f"📸 Intruder captured by {agent_name}"
-            self.send_photo(image, caption)
+        Repeated alerts from the same agent within ALERT_COALESCE_SECONDS
+        are merged, so a burst of detections doesn't hit Telegram's
+        per-chat rate limit.
         
-        return success
+        Args:
+            agent_name: Which agent detected the intruder
+            threat_level: 1-4
+            image: Optional image of intruder; it is read on the sender
+                   thread, so don't write into it afterwards
+        
+        Returns:
+            Future resolving to True if the (possibly merged) message was sent
+        """
+        return self._submit(self._deliver_intruder_alert, agent_name, threat_level, image,
+                            _now_hms())
     
-    def send_activation_alert(self, agent_name: str) -> bool:
-        """Send alert when system is activated"""
-        message = f"""
-🛡️ <b>AVENGERS GUARD ACTIVATED</b>
-
-✅ System Online
-🤖 Active Agent: {agent_name}
-⏰ Time: {datetime.now().strftime('%H:%M:%S')}
-📍 Location: Your Room
-
-<i>Your room is now under protection.</i>
-"""
-        return self.send_message(message)
+    def send_activation_alert(self, agent_name: str) -> Future:
+        """Send alert when system is activated (in the background)"""
+        message = _ACTIVATION_TMPL.format(agent_name=agent_name, time=_now_hms())
+        return self._submit(self.send_message, message)
     
-    def send_deactivation_alert(self, duration_seconds: int = 0) -> bool:
-        """Send alert when system is deactivated"""
+    def send_deactivation_alert(self, duration_seconds: int = 0) -> Future:
+        """Send alert when system is deactivated (in the background)"""
         hours = duration_seconds // 3600
         minutes = (duration_seconds % 3600) // 60
         
         duration_str = f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m"
         
-        message = f"""
-🔓 <b>AVENGERS GUARD DEACTIVATED</b>
-
-✅ System Offline
-⏱️ Duration: {duration_str}
-⏰ Time: {datetime.now().strftime('%H:%M:%S')}
-
-<i>Room security has been disengaged.</i>
-"""
-        return self.send_message(message)
+        message = _DEACTIVATION_TMPL.format(duration=duration_str, time=_now_hms())
+        return self._submit(self.send_message, message)
     
-    def send_welcome_message(self, person_name: str, role: str) -> bool:
-        """Send notification when trusted person arrives"""
-        message = f"""
-👋 <b>Welcome Home</b>
-
-✅ Trusted Person Recognized
-👤 Name: {person_name}
-🎭 Role: {role.title()}
-⏰ Time: {datetime.now().strftime('%H:%M:%S')}
-
-<i>Access granted. Welcome back!</i>
-"""
-        return self.send_message(message)
+    def send_welcome_message(self, person_name: str, role: str) -> Future:
+        """Send notification when trusted person arrives (in the background)"""
+        message = _WELCOME_TMPL.format(person_name=person_name, role=role.title(), time=_now_hms())
+        return self._submit(self.send_message, message)
     
     def send_daily_summary(self, activations: int, intruders: int, 
-                          recognized: int) -> bool:
-        """Send daily security summary"""
-        message = f"""
-📊 <b>DAILY SECURITY REPORT</b>
-
-📅 Date: {datetime.now().strftime('%Y-%m-%d')}
-
-<b>Statistics:</b>
-🔒 Activations: {activations}
-⚠️ Intruders Detected: {intruders}
-✅ Trusted Persons: {recognized}
-
-<i>Keep your room secure with Avengers Guard!</i>
-"""
-        return self.send_message(message)
+                          recognized: int) -> Future:
+        """Send daily security summary (in the background)"""
+        message = _DAILY_SUMMARY_TMPL.format(
+            date=_today(),
+            activations=activations,
+            intruders=intruders,
+            recognized=recognized
+        )
+        return self._submit(self.send_message, message)
     
     def enable(self):
         """Enable notifications"""
         self.enabled = True
-        print("📱 Telegram notifications enabled")
+        logger.info("📱 Telegram notifications enabled")
     
     def disable(self):
         """Disable notifications"""
         self.enabled = False
-        print("📴 Telegram notifications disabled")
+        logger.info("📴 Telegram notifications disabled")
+    
+    def close(self):
+        """Finish queued sends, then close the pooled HTTP connections"""
+        self._jobs.put(None)
+        self._sender.join(timeout=30)
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
 
 
 def setup_telegram_bot():